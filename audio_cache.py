@@ -0,0 +1,111 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+
+
+class AudioCache:
+    """Size-bounded LRU cache of synthesized speech on disk
+
+    Each clip is stored as its own file named by the hash of the text,
+    language and speed it was synthesized with. Files are written to a
+    temporary name and renamed into place, so a reader never sees a partial
+    clip. Once the files add up to more than max_bytes, the least recently
+    played are deleted. A hit touches the file, so the order survives restarts.
+    """
+    def __init__(self, directory, max_bytes=50 * 1024 * 1024, extension=".mp3"):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+        self._sizes = OrderedDict()  # Key to file size, least recently used first
+        self._total = 0
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def make_key(text, lang, slow):
+        """Content address for a clip: hash of the normalized text, language and speed"""
+        text = " ".join(text.split())
+        return hashlib.sha256(f"{lang}\n{int(bool(slow))}\n{text}".encode("utf-8")).hexdigest()
+
+    def path_for(self, key):
+        return os.path.join(self.directory, key + self.extension)
+
+    def get(self, key):
+        """Return the path of a cached clip, or None"""
+        with self._lock:
+            if key not in self._sizes:
+                self.misses += 1
+                return None
+            self._sizes.move_to_end(key)
+            self.hits += 1
+        path = self.path_for(key)
+        try:
+            os.utime(path)
+        except OSError:
+            # Deleted behind our back, forget it
+            with self._lock:
+                self._forget(key)
+            return None
+        return path
+
+    def put(self, key, write):
+        """Store a clip by calling write(path) with a temporary path, returning the final path"""
+        path = self.path_for(key)
+        temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        os.makedirs(self.directory, exist_ok=True)
+        try:
+            write(temp_path)
+            size = os.path.getsize(temp_path)
+            os.replace(temp_path, path)
+        finally:
+            if os.path.exists(temp_path):
+                os.remove(temp_path)
+        with self._lock:
+            self._forget(key)
+            self._sizes[key] = size
+            self._total += size
+            self._evict(keep=key)
+        return path
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sizes)
+
+    def _forget(self, key):
+        size = self._sizes.pop(key, None)
+        if size is not None:
+            self._total -= size
+
+    def _evict(self, keep=None):
+        for key in list(self._sizes):
+            if self._total <= self.max_bytes:
+                break
+            if key == keep:
+                continue
+            self._forget(key)
+            try:
+                os.remove(self.path_for(key))
+            except OSError as e:
+                # Still open for playback on some platforms, it is retried on the next start
+                print(f"[ERROR] Could not evict cached audio {key}: {e}")
+
+    def _load(self):
+        if not os.path.isdir(self.directory):
+            return
+        entries = []
+        try:
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(self.extension):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime, entry.name[:-len(self.extension)], stat.st_size))
+        except OSError as e:
+            print(f"[ERROR] Could not load audio cache {self.directory}: {e}")
+            return
+        # Oldest first, so the least recently played are evicted first
+        for _, key, size in sorted(entries):
+            self._sizes[key] = size
+            self._total += size
+        self._evict()
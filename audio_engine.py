@@ -0,0 +1,175 @@
+import io
+import threading
+from collections import OrderedDict, deque
+
+from pygame import mixer
+
+from audio_cache import AudioCache
+
+
+class AudioEngine:
+    """Synthesizes sentences in memory and keeps them decoded, ready to play
+
+    synthesizer.synthesize(text, lang, slow) returns encoded audio bytes and
+    whether they are final. They are decoded once into a mixer.Sound, so playing a
+    clip again needs no disk or network access. Decoded clips are kept in
+    memory up to max_bytes of PCM, least recently played evicted first. With
+    a disk cache, encoded clips are also kept across sessions and only
+    decoded here. Stand-in audio that is not final is played but never kept.
+
+    Clips play on a reserved mixer channel. With an end_event, the mixer
+    posts that pygame event type when a clip finishes, so nothing has to
+    poll the channel.
+    """
+    def __init__(self, synthesizer, disk_cache=None, max_bytes=32 * 1024 * 1024, end_event=None):
+        self.synthesizer = synthesizer
+        self.disk_cache = disk_cache
+        self.max_bytes = max_bytes
+        self.end_event = end_event
+        self._channel = None
+        self.stats = {"memory_hits": 0, "disk_hits": 0, "synthesized": 0}
+        self._clips = OrderedDict()  # Key to (sound, PCM size), least recently used first
+        self._total = 0
+        self._lock = threading.Lock()
+        self._pending = {}  # Key to the lock held while that clip is being loaded
+
+    def load(self, text, lang, slow):
+        """Return the decoded clip for text, or None if the mixer is not available
+
+        Concurrent loads of the same clip wait for the first one instead of
+        synthesizing it twice.
+        """
+        key = AudioCache.make_key(text, lang, slow)
+        sound = self._get(key)
+        if sound is not None:
+            return sound
+        with self._lock:
+            pending = self._pending.setdefault(key, threading.Lock())
+        try:
+            with pending:
+                sound = self._get(key)
+                if sound is not None:
+                    return sound
+                data, final = self._encoded(key, text, lang, slow)
+                if not mixer.get_init():
+                    return None
+                sound = mixer.Sound(file=io.BytesIO(data))
+                if final:
+                    self._put(key, sound)
+                return sound
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def play(self, sound):
+        """Start a clip, returning the channel it plays on"""
+        with self._lock:
+            if self._channel is None:
+                # Keep channel 0 for speech so other sounds never take it or fire its end event
+                mixer.set_reserved(1)
+                self._channel = mixer.Channel(0)
+                if self.end_event is not None:
+                    self._channel.set_endevent(self.end_event)
+            channel = self._channel
+        channel.play(sound)
+        return channel
+
+    def __len__(self):
+        with self._lock:
+            return len(self._clips)
+
+    def _encoded(self, key, text, lang, slow):
+        # Encoded bytes from the disk cache, or from the synthesizer on a miss
+        path = self.disk_cache.get(key) if self.disk_cache is not None else None
+        if path:
+            try:
+                with open(path, "rb") as f:
+                    data = f.read()
+                self.stats["disk_hits"] += 1
+                return data, True
+            except OSError as e:
+                print(f"[ERROR] Could not read cached audio {path}: {e}")
+        data, final = self.synthesizer.synthesize(text, lang, slow)
+        self.stats["synthesized"] += 1
+        if final and self.disk_cache is not None:
+            try:
+                self.disk_cache.put(key, lambda temp_path: _write_bytes(temp_path, data))
+            except OSError as e:
+                print(f"[ERROR] Could not cache audio: {e}")
+        return data, final
+
+    def _get(self, key):
+        with self._lock:
+            entry = self._clips.get(key)
+            if entry is None:
+                return None
+            self._clips.move_to_end(key)
+            self.stats["memory_hits"] += 1
+            return entry[0]
+
+    def _put(self, key, sound):
+        frequency, size, channels = mixer.get_init()
+        pcm_bytes = int(sound.get_length() * frequency * channels * abs(size) // 8)
+        with self._lock:
+            if key in self._clips:
+                return
+            self._clips[key] = (sound, pcm_bytes)
+            self._total += pcm_bytes
+            # Always keep the newest clip, even if it alone is over the limit
+            while self._total > self.max_bytes and len(self._clips) > 1:
+                _, (_, evicted) = self._clips.popitem(last=False)
+                self._total -= evicted
+
+
+class AudioPrefetcher:
+    """Loads clips the learner is about to hear on a few background threads
+
+    schedule() replaces whatever is still queued with a new list of texts,
+    most urgent first, so a stale plan from an earlier sentence or level
+    never delays the current one. cancel() drops the queue. Loads already
+    running finish and are kept, they are still useful for replays.
+    """
+    def __init__(self, load, workers=2):
+        self.load = load  # Called as load(text) on a worker thread
+        self.workers = workers
+        self.completed = 0
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._threads = []
+
+    def schedule(self, texts):
+        with self._condition:
+            self._queue = deque(dict.fromkeys(t for t in texts if t))
+            if len(self._threads) < self.workers:
+                # Workers start on the first schedule, so an idle game has none
+                for i in range(len(self._threads), self.workers):
+                    thread = threading.Thread(target=self._run, name=f"audio-prefetch-{i}", daemon=True)
+                    thread.start()
+                    self._threads.append(thread)
+            self._condition.notify_all()
+
+    def cancel(self):
+        with self._condition:
+            self._queue.clear()
+
+    def pending(self):
+        with self._condition:
+            return len(self._queue)
+
+    def _run(self):
+        while True:
+            with self._condition:
+                while not self._queue:
+                    self._condition.wait()
+                text = self._queue.popleft()
+            try:
+                self.load(text)
+                with self._condition:
+                    self.completed += 1
+            except Exception as e:
+                print(f"[ERROR] Could not prefetch audio: {e}")
+
+
+def _write_bytes(path, data):
+    with open(path, "wb") as f:
+        f.write(data)
@@ -1,161 +1,311 @@
 import json
-import boto3
+import threading
 import time
+from concurrent.futures import FIRST_COMPLETED, wait
+from response_cache import ResponseCache
+from bedrock_transport import CircuitBreaker, RetryBudget, call_with_retries
+from daemon_executor import DaemonThreadPoolExecutor
+from generation_backends import BedrockBackend
+from model_router import ModelRouter
+
+
+class CacheMissError(Exception):
+    """Raised when dynamic generation is off and no cached response exists"""
+    pass
+
 
 class BedrockClient:
-    def __init__(self, model_id="anthropic.claude-3-haiku-20240307-v1:0", region_name="us-east-1"):
+    def __init__(self, model_id="anthropic.claude-3-haiku-20240307-v1:0", region_name="us-east-1",
+                 timeout=60, max_connections=10, use_dynamic=True,
+                 cache_path=None, cache_max_entries=200, cache_ttl=30 * 24 * 3600,
+                 connect_timeout=5, call_deadline=None, max_attempts=4, endpoint_url=None,
+                 retry_budget=None, circuit_breaker=None, backend=None, models=None, router=None,
+                 hedging=True):
         self.model_id = model_id
         self.region_name = region_name
-        self.use_dynamic = True
-        
-        # Initialize Bedrock client
-        try:
-            # Try to import credentials from aws_credentials.py
-            try:
-                import aws_credentials
-                # Use hardcoded credentials
-                boto3.setup_default_session(
-                    aws_access_key_id=aws_credentials.AWS_ACCESS_KEY_ID,
-                    aws_secret_access_key=aws_credentials.AWS_SECRET_ACCESS_KEY,
-                    region_name=self.region_name
-                )
-                if hasattr(aws_credentials, 'AWS_SESSION_TOKEN') and aws_credentials.AWS_SESSION_TOKEN:
-                    boto3.setup_default_session(
-                        aws_access_key_id=aws_credentials.AWS_ACCESS_KEY_ID,
-                        aws_secret_access_key=aws_credentials.AWS_SECRET_ACCESS_KEY,
-                        aws_session_token=aws_credentials.AWS_SESSION_TOKEN,
-                        region_name=self.region_name
-                    )
-                print("[INFO] Using credentials from aws_credentials.py")
-            except ImportError:
-                print("[INFO] No aws_credentials.py found, using default credentials")
-            
-            # Create the Bedrock client
-            self.bedrock_client = boto3.client(
-                service_name='bedrock-runtime',
-                region_name=self.region_name
-            )
-            print("[SUCCESS] Successfully initialized Bedrock client")
-        except Exception as e:
-            print(f"[ERROR] Error initializing Bedrock client: {e}")
-            print(f"[ERROR] Error type: {type(e).__name__}")
-            print("[ERROR] Please check your AWS credentials and network connection")
-            raise
+        self.timeout = timeout
+        self.max_connections = max_connections
         
-    def generate_response(self, prompt):
-        """Generate a response using Amazon Bedrock"""
+        # Transport settings: every call gets up to max_attempts tries with backoff,
+        # bounded by call_deadline seconds, a shared retry budget and a circuit breaker
+        self.connect_timeout = connect_timeout
+        self.call_deadline = call_deadline
+        self.max_attempts = max_attempts
+        self.endpoint_url = endpoint_url
+        self.retry_budget = retry_budget or RetryBudget()
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # When off, responses are served only from the cache without touching the network
+        self.use_dynamic = use_dynamic
+        self.cache = ResponseCache(cache_path, cache_max_entries, cache_ttl)
+
+        # Requests go to the fastest healthy candidate model, model_id first until
+        # latencies are known. A slow request is hedged with the next model.
+        self.router = router or ModelRouter(models or [model_id])
+        self.hedging = hedging and len(self.router.model_ids) > 1
+        self._breakers = {model_id: self.circuit_breaker}
+        self._breaker_lock = threading.Lock()
+        self._hedge_executor = (DaemonThreadPoolExecutor(max_connections * 2, thread_name_prefix="bedrock-hedge")
+                                if self.hedging else None)
+
+        # Where requests are sent: Bedrock itself, or a local stand-in such as LocalBackend
+        # Hedged requests can double the connections in use
+        self.backend = backend or BedrockBackend(region_name, timeout,
+                                                 max_connections * 2 if self.hedging else max_connections,
+                                                 connect_timeout, endpoint_url)
+
+    def warm_up(self):
+        """Prepare the backend ahead of the first request"""
+        self.backend.warm_up()
+
+    def generate_response(self, prompt, max_tokens=2000, hint=""):
+        """Generate a response using Amazon Bedrock, going through the response cache
+
+        hint is appended to the prompt sent to the model but is not part of the
+        cache key, so advisory text that changes between calls does not stop
+        cached responses from being found.
+        """
+        if not self.use_dynamic:
+            # Dynamic generation is off, serve saved responses only
+            response = self._cached_response(prompt, max_tokens)
+            print("[INFO] Using cached Bedrock response")
+            return response
+
         print("[INFO] Sending request to Bedrock API...")
-        response = self._call_bedrock_api(prompt)
+        model_id, response = self._generate_routed(prompt + hint, max_tokens)
         print("[INFO] Received response from Bedrock API")
+        if response:
+            self.cache.put(self._cache_key(model_id, prompt, max_tokens), response)
         return response
-                
-    def _call_bedrock_api(self, prompt):
-        """Call the Amazon Bedrock API with the given prompt"""
-        try:
-            print(f"[INFO] Using model: {self.model_id}")
-            # For Claude 3 models, use the invoke_model API with messages format
-            if "claude-3" in self.model_id.lower():
-                request_body = {
-                    "anthropic_version": "bedrock-2023-05-31",
-                    "max_tokens": 2000,
-                    "messages": [
-                        {
-                            "role": "user",
-                            "content": prompt
-                        }
-                    ],
-                    "temperature": 0.7,
-                    "top_p": 0.9
-                }
-                
-                # Invoke the model
-                print("[INFO] Invoking Bedrock model...")
+
+    def stream_response(self, prompt, max_tokens=2000, hint=""):
+        """Generate a response, yielding pieces of text as the model produces them
+
+        If a model fails before producing any text the next candidate is
+        tried. Streams are not hedged.
+        """
+        if not self.use_dynamic:
+            # Dynamic generation is off, replay the saved response in one piece
+            response = self._cached_response(prompt, max_tokens)
+            print("[INFO] Using cached Bedrock response")
+            yield response
+            return
+
+        error = None
+        for model_id in self._candidates(max_tokens):
+            request_body = self._build_request_body(prompt + hint, max_tokens, model_id)
+            parts = []
+            try:
+                print(f"[INFO] Streaming from model: {model_id}")
                 start_time = time.time()
-                response = self.bedrock_client.invoke_model(
-                    modelId=self.model_id,
-                    body=json.dumps(request_body)
-                )
-                end_time = time.time()
-                print(f"[INFO] Model response received in {end_time - start_time:.2f} seconds")
-                
-                # Parse the response
-                print("[INFO] Parsing response...")
-                response_body = json.loads(response.get('body').read())
-                
-                # Extract content from Claude 3 response
-                if 'content' in response_body:
-                    for content_item in response_body['content']:
-                        if content_item.get('type') == 'text':
-                            return content_item.get('text', '')
-                return ""
-                
-            # For other models, use the standard invoke_model API
-            else:
-                if "claude-v2" in self.model_id.lower():
-                    # Anthropic Claude v2 format
-                    request_body = {
-                        "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
-                        "max_tokens_to_sample": 2000,
-                        "temperature": 0.7,
-                        "top_p": 0.9,
-                    }
-                elif "amazon" in self.model_id.lower():
-                    # Amazon Titan format
-                    request_body = {
-                        "inputText": prompt,
-                        "textGenerationConfig": {
-                            "maxTokenCount": 2000,
-                            "temperature": 0.7,
-                            "topP": 0.9,
-                        }
-                    }
-                else:
-                    # Default format for other models
-                    request_body = {
-                        "prompt": prompt,
-                        "max_tokens": 2000,
-                        "temperature": 0.7,
-                        "top_p": 0.9,
+                for chunk in self._invoke(model_id, self.backend.open_stream, request_body):
+                    text = self._parse_stream_chunk(chunk, model_id)
+                    if text:
+                        if not parts:
+                            print(f"[INFO] First tokens received in {time.time() - start_time:.2f} seconds")
+                        parts.append(text)
+                        yield text
+                print(f"[INFO] Model stream finished in {time.time() - start_time:.2f} seconds")
+            except Exception as e:
+                self.router.record(model_id, max_tokens, ok=False)
+                print(f"[ERROR] Bedrock streaming call failed: {e}")
+                print(f"[ERROR] Error type: {type(e).__name__}")
+                print("[ERROR] Please check your AWS credentials and network connection")
+                if parts:
+                    raise
+                error = e
+                continue
+
+            self.router.record(model_id, max_tokens, time.time() - start_time)
+            response = "".join(parts)
+            if response:
+                self.cache.put(self._cache_key(model_id, prompt, max_tokens), response)
+            return
+        raise error
+
+    def model_stats(self):
+        """Latency and error stats per candidate model and request size"""
+        return self.router.snapshot()
+
+    def _cache_key(self, model_id, prompt, max_tokens):
+        return ResponseCache.make_key(model_id, self._build_request_body(prompt, max_tokens, model_id))
+
+    def _cached_response(self, prompt, max_tokens):
+        """Find a saved response from any candidate model"""
+        for model_id in self.router.model_ids:
+            response = self.cache.get(self._cache_key(model_id, prompt, max_tokens))
+            if response is not None:
+                return response
+        raise CacheMissError("Dynamic generation is off and no cached response exists for this prompt")
+
+    def _breaker(self, model_id):
+        """Each model gets its own circuit breaker, so one throttled model does not stop the others"""
+        with self._breaker_lock:
+            if model_id not in self._breakers:
+                self._breakers[model_id] = CircuitBreaker(self.circuit_breaker.failure_threshold,
+                                                          self.circuit_breaker.reset_timeout)
+            return self._breakers[model_id]
+
+    def _candidates(self, max_tokens):
+        """Models to try in order, skipping those failing fast unless all are"""
+        ranked = self.router.ranked(max_tokens)
+        available = [model_id for model_id in ranked if not self._breaker(model_id).is_open()]
+        return available or ranked
+
+    def _generate_routed(self, prompt, max_tokens):
+        """Send a request to the best model and return (model_id, text)
+
+        If the model has not answered by its p95 latency, the same request is
+        sent to the next model and whichever answers first wins. Models whose
+        p95 is not known yet are never hedged. A failed
+        model is replaced by the next one straight away.
+        """
+        candidates = self._candidates(max_tokens)
+        if not self.hedging:
+            return candidates[0], self._call_bedrock_api(candidates[0], prompt, max_tokens)
+
+        pending = {}
+        hedged = False
+        error = None
+
+        def launch(model_id):
+            future = self._hedge_executor.submit(self._call_bedrock_api, model_id, prompt, max_tokens)
+            pending[future] = model_id
+            delay = self.router.hedge_delay(model_id, max_tokens)
+            return None if delay is None else time.monotonic() + delay
+
+        hedge_at = launch(candidates.pop(0))
+        while pending:
+            can_hedge = candidates and not hedged and hedge_at is not None
+            timeout = max(0, hedge_at - time.monotonic()) if can_hedge else None
+            done, _ = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                model_id = pending.pop(future)
+                try:
+                    return model_id, future.result()
+                except Exception as e:
+                    error = e
+            if candidates and not pending:
+                # Everything in flight failed, move on to the next model
+                hedge_at = launch(candidates.pop(0))
+            elif can_hedge and not done:
+                slow_model = next(iter(pending.values()))
+                self.router.record_hedge(slow_model, max_tokens)
+                print(f"[INFO] {slow_model} is past its p95 latency, hedging with {candidates[0]}")
+                hedged = True
+                launch(candidates.pop(0))
+        raise error
+
+    def _build_request_body(self, prompt, max_tokens=2000, model_id=None):
+        """Build the request body in the format expected by the model"""
+        model_id = (model_id or self.model_id).lower()
+        if "claude-3" in model_id:
+            # For Claude 3 models, use the messages format
+            return {
+                "anthropic_version": "bedrock-2023-05-31",
+                "max_tokens": max_tokens,
+                "messages": [
+                    {
+                        "role": "user",
+                        "content": prompt
                     }
-                
-                # Invoke the model
-                print("[INFO] Invoking Bedrock model...")
-                start_time = time.time()
-                response = self.bedrock_client.invoke_model(
-                    modelId=self.model_id,
-                    body=json.dumps(request_body)
-                )
-                end_time = time.time()
-                print(f"[INFO] Model response received in {end_time - start_time:.2f} seconds")
-                
-                # Parse the response based on the model
-                print("[INFO] Parsing response...")
-                response_body = json.loads(response.get('body').read())
-                
-                if "claude-v2" in self.model_id.lower():
-                    return response_body.get('completion', '')
-                elif "amazon" in self.model_id.lower():
-                    return response_body.get('results', [{}])[0].get('outputText', '')
-                else:
-                    # Default response parsing
-                    return response_body.get('generated_text', '')
-                
+                ],
+                "temperature": 0.7,
+                "top_p": 0.9
+            }
+        elif "claude-v2" in model_id:
+            # Anthropic Claude v2 format
+            return {
+                "prompt": f"\n\nHuman: {prompt}\n\nAssistant:",
+                "max_tokens_to_sample": max_tokens,
+                "temperature": 0.7,
+                "top_p": 0.9,
+            }
+        elif "amazon" in model_id:
+            # Amazon Titan format
+            return {
+                "inputText": prompt,
+                "textGenerationConfig": {
+                    "maxTokenCount": max_tokens,
+                    "temperature": 0.7,
+                    "topP": 0.9,
+                }
+            }
+        else:
+            # Default format for other models
+            return {
+                "prompt": prompt,
+                "max_tokens": max_tokens,
+                "temperature": 0.7,
+                "top_p": 0.9,
+            }
+
+    def _parse_response_body(self, response_body, model_id=None):
+        """Extract the generated text from a model response body"""
+        model_id = (model_id or self.model_id).lower()
+        if "claude-3" in model_id:
+            # Extract content from Claude 3 response
+            if 'content' in response_body:
+                for content_item in response_body['content']:
+                    if content_item.get('type') == 'text':
+                        return content_item.get('text', '')
+            return ""
+        elif "claude-v2" in model_id:
+            return response_body.get('completion', '')
+        elif "amazon" in model_id:
+            return response_body.get('results', [{}])[0].get('outputText', '')
+        else:
+            # Default response parsing
+            return response_body.get('generated_text', '')
+
+    def _invoke(self, model_id, method, request_body):
+        """Call a backend method with retries, backoff and the model's circuit breaker"""
+        body = json.dumps(request_body)
+        deadline = time.monotonic() + self.call_deadline if self.call_deadline else None
+        return call_with_retries(
+            lambda: method(model_id, body),
+            deadline=deadline,
+            max_attempts=self.max_attempts,
+            retry_budget=self.retry_budget,
+            circuit_breaker=self._breaker(model_id),
+            # A retry that could still be running at the deadline is not started
+            attempt_timeout=self.connect_timeout + self.timeout,
+        )
+
+    def _parse_stream_chunk(self, chunk, model_id=None):
+        """Extract the text delta from one streamed response chunk"""
+        model_id = (model_id or self.model_id).lower()
+        if "claude-3" in model_id:
+            if chunk.get('type') == 'content_block_delta':
+                return chunk.get('delta', {}).get('text', '')
+            return ""
+        elif "claude-v2" in model_id:
+            return chunk.get('completion', '')
+        elif "amazon" in model_id:
+            return chunk.get('outputText', '')
+        else:
+            return chunk.get('generated_text', '')
+
+    def _call_bedrock_api(self, model_id, prompt, max_tokens):
+        """Call the Amazon Bedrock API with one model, recording its latency for routing"""
+        try:
+            print(f"[INFO] Using model: {model_id}")
+
+            # Invoke the model
+            print("[INFO] Invoking Bedrock model...")
+            start_time = time.time()
+            request_body = self._build_request_body(prompt, max_tokens, model_id)
+            response_body = self._invoke(model_id, self.backend.invoke, request_body)
+            end_time = time.time()
+            print(f"[INFO] Model response received in {end_time - start_time:.2f} seconds")
+            self.router.record(model_id, max_tokens, end_time - start_time)
+
+            # Parse the response based on the model
+            print("[INFO] Parsing response...")
+            return self._parse_response_body(response_body, model_id)
+
         except Exception as e:
+            self.router.record(model_id, max_tokens, ok=False)
             print(f"[ERROR] Bedrock API call failed: {e}")
             print(f"[ERROR] Error type: {type(e).__name__}")
             print("[ERROR] Please check your AWS credentials and network connection")
             raise
-            
-    def _get_mock_sentences(self, difficulty):
-        """Generate default sentences when API calls fail"""
-        print(f"[ERROR] Failed to get sentences from Bedrock API for difficulty: {difficulty}")
-        print("[INFO] Returning default sentences instead")
-        
-        # Return a minimal set of default sentences
-        return [
-            {
-                "sentence": "This is a default sentence for practice.",
-                "context": "API fallback",
-                "pronunciation_tip": "Please try again later when the API is available."
-            }
-        ]
\ No newline at end of file
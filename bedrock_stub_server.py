@@ -0,0 +1,107 @@
+"""Local stand-in for the Bedrock runtime InvokeModel endpoints.
+
+Answers InvokeModel requests with a Claude 3 style response holding a JSON
+array of practice sentences, after a configurable latency.
+InvokeModelWithResponseStream requests get the same text as
+content_block_delta chunks in AWS event stream framing. A fraction
+of requests can be rejected with ThrottlingException to reproduce
+throttling storms against the real botocore transport.
+
+    python bedrock_stub_server.py --port 8765 --throttle-rate 0.5 --latency 0.2
+
+Then set BEDROCK_ENDPOINT_URL = "http://127.0.0.1:8765" in config.py and
+provide any AWS credentials (they are not checked).
+"""
+import argparse
+import base64
+import binascii
+import json
+import random
+import struct
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def event_frame(payload, event_type="chunk"):
+    """Encode one AWS event stream message: prelude, headers, payload and CRCs"""
+    headers = b""
+    for name, value in ((":event-type", event_type), (":content-type", "application/json"),
+                        (":message-type", "event")):
+        name, value = name.encode("utf-8"), value.encode("utf-8")
+        # Header value type 7 is a string with a two byte length
+        headers += struct.pack(">B", len(name)) + name + struct.pack(">BH", 7, len(value)) + value
+    total = 12 + len(headers) + len(payload) + 4
+    prelude = struct.pack(">II", total, len(headers))
+    message = prelude + struct.pack(">I", binascii.crc32(prelude)) + headers + payload
+    return message + struct.pack(">I", binascii.crc32(message))
+
+
+def stream_body(text, chunk_chars=24):
+    """Event stream body carrying text as Claude 3 content_block_delta chunks"""
+    frames = []
+    for i in range(0, len(text), chunk_chars):
+        chunk = {"type": "content_block_delta", "index": 0,
+                 "delta": {"type": "text_delta", "text": text[i:i + chunk_chars]}}
+        payload = json.dumps({"bytes": base64.b64encode(json.dumps(chunk).encode("utf-8")).decode("ascii")})
+        frames.append(event_frame(payload.encode("utf-8")))
+    return b"".join(frames)
+
+
+def make_handler(throttle_rate, latency, seed):
+    rng = random.Random(seed)
+    lock = threading.Lock()
+    counter = {"requests": 0}
+
+    class StubHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            self.rfile.read(length)
+            with lock:
+                counter["requests"] += 1
+                request_num = counter["requests"]
+                throttled = rng.random() < throttle_rate
+            time.sleep(latency)
+
+            content_type = "application/json"
+            if throttled:
+                body = json.dumps({"message": "Too many requests, please wait before trying again."}).encode("utf-8")
+                self.send_response(429)
+                self.send_header("x-amzn-ErrorType", "ThrottlingException")
+            else:
+                sentences = [{"sentence": f"Stub sentence {request_num}-{i} for pronunciation practice.",
+                              "context": "Local stub endpoint",
+                              "pronunciation_tip": "Speak each word clearly."} for i in range(8)]
+                text = json.dumps(sentences)
+                if self.path.rstrip("/").endswith("/invoke-with-response-stream"):
+                    body = stream_body(text)
+                    content_type = "application/vnd.amazon.eventstream"
+                else:
+                    body = json.dumps({"content": [{"type": "text", "text": text}]}).encode("utf-8")
+                self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            print(f"[STUB] {self.address_string()} {format % args}")
+
+    return StubHandler
+
+
+def serve(port=8765, throttle_rate=0.0, latency=0.0, seed=0):
+    """Create the stub server, the caller runs serve_forever()"""
+    return ThreadingHTTPServer(("127.0.0.1", port), make_handler(throttle_rate, latency, seed))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local Bedrock InvokeModel and InvokeModelWithResponseStream stub")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="fraction of requests to throttle")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds to wait before answering")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    server = serve(args.port, args.throttle_rate, args.latency, args.seed)
+    print(f"[INFO] Bedrock stub listening on http://127.0.0.1:{args.port}")
+    server.serve_forever()
@@ -0,0 +1,170 @@
+import random
+import threading
+import time
+
+from botocore.exceptions import (ClientError, ConnectionClosedError, ConnectTimeoutError,
+                                 EndpointConnectionError, ReadTimeoutError)
+
+# Error codes worth retrying, Bedrock reports throttling under several names
+RETRYABLE_ERROR_CODES = {
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailableException",
+    "ModelNotReadyException",
+    "InternalServerException",
+    "ModelTimeoutException",
+}
+
+RETRYABLE_EXCEPTIONS = (ConnectionClosedError, ConnectTimeoutError, EndpointConnectionError, ReadTimeoutError)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling Bedrock while the circuit breaker is open"""
+    pass
+
+
+class RetryBudgetExhaustedError(Exception):
+    """Raised when a retry is needed but the global retry budget is empty"""
+    pass
+
+
+def is_retryable(error):
+    """Check whether a failed call is worth retrying"""
+    if isinstance(error, ClientError):
+        return error.response.get("Error", {}).get("Code") in RETRYABLE_ERROR_CODES
+    return isinstance(error, RETRYABLE_EXCEPTIONS)
+
+
+class RetryBudget:
+    """Token bucket that limits retries to a fraction of all requests
+
+    Every request deposits `ratio` tokens and every retry withdraws one,
+    so under a sustained outage retries settle at about ratio * requests
+    instead of multiplying the load on an already struggling service.
+    """
+    def __init__(self, ratio=0.2, initial=10, max_tokens=20):
+        self.ratio = ratio
+        self.max_tokens = max_tokens
+        self._tokens = initial
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_withdraw(self):
+        """Take one retry token, returning False if none are left"""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    @property
+    def tokens(self):
+        with self._lock:
+            return self._tokens
+
+
+class CircuitBreaker:
+    """Fails fast after repeated retryable failures, then probes with a single call
+
+    Closed: calls pass through. After failure_threshold consecutive failures
+    the breaker opens and rejects calls for reset_timeout seconds. Then it is
+    half-open and lets one trial call through; success closes it again and
+    failure re-opens it.
+    """
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold=5, reset_timeout=30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self):
+        """Raise CircuitOpenError if a call should not be attempted now"""
+        with self._lock:
+            if self.state == self.OPEN:
+                if time.monotonic() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError("Bedrock circuit breaker is open, failing fast")
+                self.state = self.HALF_OPEN
+                self._trial_in_flight = False
+            if self.state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    raise CircuitOpenError("Bedrock circuit breaker is half-open, trial call in progress")
+                self._trial_in_flight = True
+
+    def is_open(self):
+        """True while calls are being rejected without a trial"""
+        with self._lock:
+            return self.state == self.OPEN and time.monotonic() - self._opened_at < self.reset_timeout
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+                if self.state != self.OPEN:
+                    print(f"[ERROR] Opening Bedrock circuit breaker for {self.reset_timeout}s")
+                self.state = self.OPEN
+                self._opened_at = time.monotonic()
+                self._trial_in_flight = False
+
+    def release(self):
+        """Forget a half-open trial call that ended without a verdict"""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+def call_with_retries(call, deadline=None, max_attempts=4, base_delay=0.5, max_delay=8.0,
+                      retry_budget=None, circuit_breaker=None, attempt_timeout=0):
+    """Run call() with exponential backoff and full jitter
+
+    Only retryable errors are retried, and each retry needs a token from the
+    retry budget. Only first attempts add to the budget, so retries cannot
+    pay for themselves. No retry is started unless its backoff plus
+    attempt_timeout, the longest a single attempt can take, ends before the
+    deadline, given as a time.monotonic() timestamp.
+    """
+    attempt = 0
+    while True:
+        attempt += 1
+        if circuit_breaker:
+            circuit_breaker.allow()
+        if retry_budget and attempt == 1:
+            retry_budget.record_request()
+        try:
+            result = call()
+        except Exception as e:
+            if not is_retryable(e):
+                if circuit_breaker:
+                    circuit_breaker.release()
+                raise
+            if circuit_breaker:
+                circuit_breaker.record_failure()
+            if attempt >= max_attempts:
+                raise
+
+            delay = random.uniform(0, min(max_delay, base_delay * (2 ** (attempt - 1))))
+            if deadline is not None and time.monotonic() + delay + attempt_timeout >= deadline:
+                raise
+            if retry_budget and not retry_budget.try_withdraw():
+                raise RetryBudgetExhaustedError(f"Retry budget exhausted after: {e}") from e
+            print(f"[INFO] Retrying Bedrock call in {delay:.2f}s after {type(e).__name__} (attempt {attempt})")
+            time.sleep(delay)
+            continue
+
+        if circuit_breaker:
+            circuit_breaker.record_success()
+        return result
@@ -0,0 +1,238 @@
+"""Headless rendering benchmark for the Pronunciation Master screens.
+
+Runs every screen under SDL's dummy video and audio drivers, so no display,
+microphone or Bedrock access is needed. Results are written as JSON and
+checked against the thresholds in benchmark_thresholds.json.
+
+    python benchmark.py [--frames 300] [--output benchmark_results.json]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+import pygame
+from pronunciation_master import PronunciationMaster, Level
+from fonts import font_stats, reset_font_stats
+
+SHORT_SENTENCE = "Hello, my name is Alex."
+SHORT_CONTEXT = "Introducing yourself to a new person."
+LONG_SENTENCE = ("The enthusiastic archaeologist carefully catalogued seventeen extraordinarily "
+                 "well-preserved ceramic fragments discovered beneath the crumbling "
+                 "Mediterranean monastery's foundations yesterday afternoon.")
+LONG_CONTEXT = ("Describing an unexpected discovery to colleagues during a long video call "
+                "about the summer excavation season and its funding.")
+LONG_FEEDBACK = "Try again. You said: " + " ".join(["the enthusiastic archaeologist carefully"] * 6)
+LONG_TIP = ("Stress the second syllable of 'archaeologist' and keep the 'ch' hard like a 'k'. "
+            "Say 'extraordinarily' slowly first: ex-TRAOR-di-nar-i-ly.")
+
+
+class WidgetTimer:
+    """Wraps widget draw methods to accumulate time spent per widget"""
+    def __init__(self, widgets):
+        self.totals = {}
+        for name, widget in widgets.items():
+            self.totals[name] = 0.0
+            widget.draw = self._wrap(name, widget.draw)
+
+    def _wrap(self, name, draw):
+        def timed_draw(screen):
+            start = time.perf_counter()
+            draw(screen)
+            self.totals[name] += time.perf_counter() - start
+        return timed_draw
+
+    def reset(self):
+        for name in self.totals:
+            self.totals[name] = 0.0
+
+
+def make_game():
+    """Create a game with synthetic levels and no saved progress"""
+    game = PronunciationMaster()
+    game.save_progress = lambda: None
+    game.levels = [Level(1, "1", [{"sentence": SHORT_SENTENCE, "context": SHORT_CONTEXT,
+                                   "pronunciation_tip": "Stress the first syllable."}])]
+    game.current_level = 0
+    return game
+
+
+def scenario_start_screen(game):
+    game.game_started = False
+    game.drawn_screen = None
+    def frame(i):
+        game.drawn_screen = None  # Force a full repaint every frame
+        return game.render()
+    return frame
+
+
+def scenario_game(sentence, context, feedback, tip):
+    def setup(game):
+        game.game_started = True
+        game.drawn_screen = None
+        game.sentence_display.set_sentence(sentence, context)
+        game.feedback_display.set_feedback(feedback, tip, False)
+        def frame(i):
+            game.drawn_screen = None  # Force a full repaint every frame
+            return game.render()
+        return frame
+    return setup
+
+
+def scenario_feedback_churn(game):
+    game.game_started = True
+    game.drawn_screen = None
+    game.sentence_display.set_sentence(LONG_SENTENCE, LONG_CONTEXT)
+    def frame(i):
+        # Alternate between two feedback strings, as the recognition thread does
+        if i % 2:
+            game.feedback_display.set_feedback(LONG_FEEDBACK, LONG_TIP, False)
+        else:
+            game.feedback_display.set_feedback("Could not understand audio. Please try again.", "", False)
+        game.status_display.set_status("Listening..." if i % 2 else "Processing speech...")
+        return game.render()
+    return frame
+
+
+def scenario_button_hover(game):
+    game.game_started = False
+    game.drawn_screen = None
+    buttons = game.start_widgets
+    positions = [button.rect.center for button in buttons] + [(5, 5)]
+    def frame(i):
+        mouse_pos = positions[i % len(positions)]
+        for button in buttons:
+            button.check_hover(mouse_pos)
+        return game.render()
+    return frame
+
+
+SCENARIOS = {
+    "start_screen": scenario_start_screen,
+    "game_short_text": scenario_game(SHORT_SENTENCE, SHORT_CONTEXT,
+                                     "Very good! You said: hello my name is alex", "Stress the first syllable."),
+    "game_long_text": scenario_game(LONG_SENTENCE, LONG_CONTEXT, LONG_FEEDBACK, LONG_TIP),
+    "feedback_churn": scenario_feedback_churn,
+    "button_hover_churn": scenario_button_hover,
+}
+
+
+def run_scenario(game, timer, setup, frames):
+    """Time frames of one scenario and measure per-frame allocations"""
+    frame = setup(game)
+
+    # Warm-up so caches are populated before measuring
+    for i in range(min(frames, 30)):
+        frame(i)
+
+    timer.reset()
+    reset_font_stats()
+    pixels = 0
+    start = time.perf_counter()
+    for i in range(frames):
+        for rect in frame(i):
+            pixels += rect.width * rect.height
+    elapsed = time.perf_counter() - start
+    fonts_created = font_stats()["created"]
+
+    # Separate pass for allocations, since tracing distorts timings
+    alloc_frames = max(1, frames // 10)
+    tracemalloc.start()
+    peak_total = 0
+    for i in range(alloc_frames):
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        frame(i)
+        _, peak = tracemalloc.get_traced_memory()
+        peak_total += peak - current
+    tracemalloc.stop()
+
+    return {
+        "frames": frames,
+        "fps": frames / elapsed if elapsed else float("inf"),
+        "ms_per_frame": elapsed * 1000 / frames,
+        "widget_ms_per_frame": {name: total * 1000 / frames for name, total in timer.totals.items()},
+        "pixels_updated_per_frame": pixels / frames,
+        "alloc_bytes_per_frame": peak_total / alloc_frames,
+        "fonts_created": fonts_created,
+    }
+
+
+def check_thresholds(results, thresholds):
+    """Return a list of threshold violations"""
+    failures = []
+    for name, limits in thresholds.items():
+        result = results.get(name)
+        if result is None:
+            continue
+        if "min_fps" in limits and result["fps"] < limits["min_fps"]:
+            failures.append(f"{name}: {result['fps']:.0f} fps is below {limits['min_fps']}")
+        if "max_alloc_bytes_per_frame" in limits and result["alloc_bytes_per_frame"] > limits["max_alloc_bytes_per_frame"]:
+            failures.append(f"{name}: {result['alloc_bytes_per_frame']:.0f} bytes/frame is above "
+                            f"{limits['max_alloc_bytes_per_frame']}")
+        if "max_fonts_created" in limits and result["fonts_created"] > limits["max_fonts_created"]:
+            failures.append(f"{name}: {result['fonts_created']} fonts created after warm-up")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless rendering benchmark")
+    parser.add_argument("--frames", type=int, default=300, help="frames measured per scenario")
+    parser.add_argument("--output", default="benchmark_results.json", help="where to write the results")
+    parser.add_argument("--thresholds", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                             "benchmark_thresholds.json"),
+                        help="regression thresholds to check against")
+    parser.add_argument("--scenario", action="append", choices=sorted(SCENARIOS),
+                        help="run only this scenario (may be repeated)")
+    args = parser.parse_args()
+
+    game = make_game()
+    widgets = {
+        "character": game.guide,
+        "sentence_display": game.sentence_display,
+        "feedback_display": game.feedback_display,
+        "status_display": game.status_display,
+        "toggle_button": game.toggle_button,
+        "next_level_button": game.next_level_button,
+        "resume_button": game.resume_button,
+        "restart_button": game.restart_button,
+        "toggle_dynamic_button": game.toggle_dynamic_button,
+    }
+    timer = WidgetTimer(widgets)
+
+    results = {}
+    for name in args.scenario or SCENARIOS:
+        results[name] = run_scenario(game, timer, SCENARIOS[name], args.frames)
+        print(f"{name:20s} {results[name]['fps']:9.1f} fps  {results[name]['ms_per_frame']:7.3f} ms/frame  "
+              f"{results[name]['alloc_bytes_per_frame']:9.0f} B/frame")
+
+    thresholds = {}
+    if os.path.exists(args.thresholds):
+        with open(args.thresholds, "r") as f:
+            thresholds = json.load(f)
+    failures = check_thresholds(results, thresholds)
+
+    report = {
+        "pygame": pygame.version.ver,
+        "video_driver": pygame.display.get_driver(),
+        "results": results,
+        "thresholds": thresholds,
+        "failures": failures,
+    }
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {args.output}")
+
+    for failure in failures:
+        print(f"[REGRESSION] {failure}")
+    pygame.quit()
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
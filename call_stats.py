@@ -0,0 +1,50 @@
+import threading
+import time
+from contextlib import contextmanager
+
+
+class CallStats:
+    """Counters for one engine's calls, safe to update from several threads
+
+    Tracks calls, errors and the latency of calls that did not fail, both
+    the latest and a running mean. Extra named counters start at zero and
+    are raised with increment().
+    """
+    def __init__(self, *counters):
+        self._values = {"calls": 0, "errors": 0, **dict.fromkeys(counters, 0),
+                        "last_latency": None, "mean_latency": None}
+        self._lock = threading.Lock()
+
+    def record(self, latency, failed=False):
+        with self._lock:
+            self._values["calls"] += 1
+            if failed:
+                self._values["errors"] += 1
+                return
+            successes = self._values["calls"] - self._values["errors"]
+            mean = self._values["mean_latency"] or 0.0
+            self._values["mean_latency"] = mean + (latency - mean) / successes
+            self._values["last_latency"] = latency
+
+    @contextmanager
+    def timed(self, is_failure=lambda error: True):
+        """Record the call made in the block, as an error if it raises one is_failure accepts"""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception as e:
+            self.record(time.perf_counter() - start, failed=is_failure(e))
+            raise
+        self.record(time.perf_counter() - start)
+
+    def increment(self, name):
+        with self._lock:
+            self._values[name] += 1
+
+    def __getitem__(self, name):
+        with self._lock:
+            return self._values[name]
+
+    def as_dict(self):
+        with self._lock:
+            return dict(self._values)
@@ -3,6 +3,7 @@ WINDOW_WIDTH = 800
 WINDOW_HEIGHT = 600
 WINDOW_TITLE = "Pronunciation Master"
 FPS = 60
+IDLE_WAIT_MS = 500  # Longest the loop blocks waiting for events when nothing changes
 
 # Colors
 BLACK = (0, 0, 0)
@@ -18,9 +19,81 @@ LIGHT_BLUE = (100, 150, 255)
 FONT_SIZE = 24
 CHARACTER_WIDTH = 200
 CHARACTER_HEIGHT = 300
+SCALED_ASSET_CACHE_DIR = "assets/.cache"  # Pre-scaled images, set to None to disable
 
 # AWS settings
 MODEL_ID = "anthropic.claude-3-haiku-20240307-v1:0"
+# Models requests may be routed to, MODEL_ID is preferred until latencies are known.
+# Claude 3, Claude v2 (e.g. "anthropic.claude-v2:1") and Titan (e.g. "amazon.titan-text-express-v1") formats work
+MODEL_CANDIDATES = [MODEL_ID, "anthropic.claude-3-sonnet-20240229-v1:0"]
+# Send a backup request to the next model when one runs past its p95 latency. Off by default,
+# as the backup is Sonnet, which costs several times more per call than Haiku
+MODEL_HEDGING = False
+ROUTER_EWMA_ALPHA = 0.3  # Weight of the newest call in the latency and error averages
+ROUTER_MAX_ERROR_RATE = 0.5  # Models failing more often than this are tried last
+HEDGE_MIN_SAMPLES = 5  # Calls of a model and request size needed before it is ever hedged
 AWS_REGION = "us-east-1"
-USE_MOCK = False  # Set to False to use actual Bedrock API
-USE_DYNAMIC_SENTENCES = True  # Always use dynamically generated sentences
\ No newline at end of file
+USE_MOCK = False  # Set to True to generate sentences offline with the local backend below
+USE_DYNAMIC_SENTENCES = True  # When False, sentences come only from the response cache
+RESPONSE_CACHE_PATH = "bedrock_cache.json"
+RESPONSE_CACHE_MAX_ENTRIES = 200
+RESPONSE_CACHE_TTL = 30 * 24 * 3600  # Seconds before a cached response expires
+
+# Bedrock transport settings
+BEDROCK_ENDPOINT_URL = None  # Set to a local stub endpoint for testing
+BEDROCK_CONNECT_TIMEOUT = 5
+BEDROCK_CALL_DEADLINE = 45  # Seconds a call may spend including retries, a retry that could overrun it is not started
+BEDROCK_MAX_ATTEMPTS = 4
+BEDROCK_RETRY_BUDGET_RATIO = 0.2  # Retries allowed per request, averaged over time
+BEDROCK_BREAKER_THRESHOLD = 5  # Consecutive failures before failing fast
+BEDROCK_BREAKER_RESET = 30  # Seconds before a trial call is let through
+
+# Local generation backend, used when USE_MOCK is True
+MOCK_SEED = 0  # Same seed, same sentences and failures
+MOCK_LATENCY = {"distribution": "lognormal", "median": 1.5, "sigma": 0.5}  # Seconds per call
+MOCK_MODEL_LATENCY = {}  # Per model overrides of MOCK_LATENCY
+MOCK_THROTTLE_RATE = 0.0  # Share of calls rejected with ThrottlingException
+MOCK_MALFORMED_RATE = 0.0  # Share of responses with broken JSON
+MOCK_TRUNCATE_RATE = 0.0  # Share of responses cut off part way
+
+# Sentence generation settings
+LEVEL_COUNT = 10
+SENTENCES_PER_LEVEL = 5
+GENERATION_MAX_WORKERS = 4  # Bedrock calls allowed in flight at once
+GENERATION_TIMEOUT = 30  # Seconds to wait for a single Bedrock response
+GENERATION_STREAMING = True  # Stream level 1 so play starts with its first sentence
+GENERATION_BATCHED = True  # Request levels 2-10 in one call, re-requesting short levels individually
+BATCH_SENTENCES_PER_LEVEL = 6
+BATCH_MAX_TOKENS = 4096
+NEAR_DUPLICATE_THRESHOLD = 0.35  # Word-pair Jaccard similarity at which sentences count as the same
+SENTENCE_HISTORY_PATH = "sentence_history.txt"  # Every sentence ever used, for near-duplicate checks
+SENTENCE_HISTORY_MAX = 20000
+EXCLUSION_HINT_LIMIT = 10  # Overused sentence openings listed in prompts
+
+# Fallback content
+LEVEL_DEADLINE = 3.0  # Seconds the learner waits on generation before a level is filled from the pool
+FALLBACK_POOL_PATH = "sentence_pool.json"  # Spare generated sentences kept for filling levels instantly
+FALLBACK_POOL_MAX_PER_LEVEL = 40
+
+# Audio settings
+TTS_LANG = "en"
+TTS_SLOW = False
+TTS_ENGINES = ["gtts", "espeak-ng"]  # Started together, the first is preferred, unavailable ones are skipped
+TTS_RACE_DEADLINE = 1.5  # Seconds to wait for the preferred engine before playing whichever finished first
+TTS_REQUEST_TIMEOUT = 10  # Seconds per engine request, so a stalled connection fails instead of hanging
+TTS_TIMEOUT = 15  # Seconds before a sentence is given up on when no engine has answered
+TTS_CACHE_DIR = "audio_cache"  # Synthesized sentences, so replays skip the text-to-speech service
+TTS_CACHE_MAX_BYTES = 50 * 1024 * 1024
+AUDIO_MEMORY_MAX_BYTES = 32 * 1024 * 1024  # Decoded sentences kept ready to play
+AUDIO_BUFFER_SIZE = 512  # Mixer buffer in samples, smaller starts playback sooner
+PREFETCH_WORKERS = 2  # Sentences synthesized ahead in parallel
+PREFETCH_NEXT_LEVEL_SENTENCES = 2  # Sentences of the next level synthesized before it starts
+
+# Speech input settings
+MIC_CALIBRATION_SECONDS = 1.0  # Ambient noise calibration when the microphone is opened
+MIC_RECALIBRATION_SECONDS = 0.5
+MIC_RECALIBRATE_INTERVAL = 30.0  # Seconds between background recalibrations while nobody is speaking
+LISTEN_TIMEOUT = 5  # Seconds to wait for the learner to start speaking
+PHRASE_TIME_LIMIT = 5
+SPEECH_RECOGNIZERS = ["vosk", "google"]  # Tried in order, ones not installed are skipped
+VOSK_MODEL_PATH = "models/vosk-model-small-en-us-0.15"  # Offline model, see README
@@ -0,0 +1,71 @@
+import queue
+import threading
+from concurrent.futures import Executor, Future
+
+
+class DaemonThreadPoolExecutor(Executor):
+    """Thread pool whose workers never hold up the process exiting
+
+    ThreadPoolExecutor joins its workers at interpreter exit, so a network
+    call still running when the window closes keeps the process alive until
+    it returns, up to its whole deadline. These workers are daemon threads
+    and are simply dropped at exit, which suits fire-and-forget calls whose
+    results nobody waits for once the game quits. Futures are the standard
+    concurrent.futures ones, so wait() and as_completed() work with them.
+    """
+    def __init__(self, max_workers, thread_name_prefix="worker"):
+        self.max_workers = max_workers
+        self.thread_name_prefix = thread_name_prefix
+        self._queue = queue.SimpleQueue()
+        self._threads = []
+        self._idle = 0
+        self._shutdown = False
+        self._lock = threading.Lock()
+
+    def submit(self, fn, /, *args, **kwargs):
+        future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new futures after shutdown")
+            self._queue.put((future, fn, args, kwargs))
+            if self._idle:
+                self._idle -= 1
+            elif len(self._threads) < self.max_workers:
+                thread = threading.Thread(target=self._run, name=f"{self.thread_name_prefix}-{len(self._threads)}",
+                                          daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        return future
+
+    def shutdown(self, wait=True, *, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while True:
+                    try:
+                        item = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    item[0].cancel()
+            for _ in self._threads:
+                self._queue.put(None)  # One stop marker per worker, after any work still queued
+            threads = list(self._threads)
+        if wait:
+            for thread in threads:
+                thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            future, fn, args, kwargs = item
+            if future.set_running_or_notify_cancel():
+                try:
+                    result = fn(*args, **kwargs)
+                except BaseException as e:
+                    future.set_exception(e)
+                else:
+                    future.set_result(result)
+            with self._lock:
+                self._idle += 1
@@ -0,0 +1,53 @@
+import threading
+from collections import OrderedDict
+import pygame
+
+# Maximum number of distinct fonts kept loaded
+FONT_CACHE_SIZE = 32
+
+_fonts = OrderedDict()
+_fonts_lock = threading.Lock()
+_stats = {"hits": 0, "created": 0, "evicted": 0}
+
+
+def get_font(face, size, bold=False):
+    """Return a shared font for (face, size, bold), creating it on first use
+
+    face=None selects pygame's default font, any other name is looked up
+    with SysFont.
+    """
+    key = (face, size, bold)
+    with _fonts_lock:
+        font = _fonts.get(key)
+        if font is not None:
+            _fonts.move_to_end(key)
+            _stats["hits"] += 1
+            return font
+
+        if face is None:
+            font = pygame.font.Font(None, size)
+            font.set_bold(bold)
+        else:
+            font = pygame.font.SysFont(face, size, bold=bold)
+        _fonts[key] = font
+        _stats["created"] += 1
+
+        while len(_fonts) > FONT_CACHE_SIZE:
+            _fonts.popitem(last=False)
+            _stats["evicted"] += 1
+        return font
+
+
+def font_stats():
+    """Return a copy of the registry counters"""
+    with _fonts_lock:
+        stats = dict(_stats)
+        stats["loaded"] = len(_fonts)
+    return stats
+
+
+def reset_font_stats():
+    """Zero the registry counters, keeping the loaded fonts"""
+    with _fonts_lock:
+        for key in _stats:
+            _stats[key] = 0
@@ -0,0 +1,270 @@
+import hashlib
+import json
+import math
+import random
+import re
+import threading
+import time
+
+from botocore.exceptions import ClientError
+
+
+class BedrockBackend:
+    """Sends model requests to the Bedrock runtime through boto3
+
+    invoke() returns the decoded response body and open_stream() returns an
+    iterator of decoded stream chunks. Errors are raised from the call itself
+    so the caller's retry logic sees them before any output is consumed.
+    """
+    def __init__(self, region_name="us-east-1", timeout=60, max_connections=10,
+                 connect_timeout=5, endpoint_url=None):
+        self.region_name = region_name
+        self.timeout = timeout
+        self.max_connections = max_connections
+        self.connect_timeout = connect_timeout
+        self.endpoint_url = endpoint_url  # Point at a local stub endpoint for testing
+
+        # The boto3 client is created on the first request that needs the network
+        self.client = None
+        self._client_lock = threading.Lock()
+
+    def warm_up(self):
+        """Create the runtime client ahead of the first request"""
+        self._get_client()
+
+    def invoke(self, model_id, body):
+        response = self._get_client().invoke_model(modelId=model_id, body=body)
+        return json.loads(response.get('body').read())
+
+    def open_stream(self, model_id, body):
+        response = self._get_client().invoke_model_with_response_stream(modelId=model_id, body=body)
+        return self._iter_chunks(response)
+
+    def _iter_chunks(self, response):
+        for event in response.get('body'):
+            chunk = event.get('chunk')
+            if chunk:
+                yield json.loads(chunk['bytes'])
+
+    def _get_client(self):
+        """Return the Bedrock runtime client, creating it on first use"""
+        with self._client_lock:
+            if self.client is None:
+                self.client = self._create_client()
+            return self.client
+
+    def _create_client(self):
+        """Resolve credentials and create the Bedrock runtime client"""
+        try:
+            # boto3 takes a noticeable part of a second to import, so load it only when needed
+            import boto3
+            from botocore.config import Config
+
+            # Try to import credentials from aws_credentials.py
+            try:
+                import aws_credentials
+                # Use hardcoded credentials
+                boto3.setup_default_session(
+                    aws_access_key_id=aws_credentials.AWS_ACCESS_KEY_ID,
+                    aws_secret_access_key=aws_credentials.AWS_SECRET_ACCESS_KEY,
+                    aws_session_token=getattr(aws_credentials, 'AWS_SESSION_TOKEN', None) or None,
+                    region_name=self.region_name
+                )
+                print("[INFO] Using credentials from aws_credentials.py")
+            except ImportError:
+                print("[INFO] No aws_credentials.py found, using default credentials")
+
+            # Create the Bedrock client
+            # Retries are handled by call_with_retries, botocore only does one attempt
+            # but keeps adaptive mode's client-side rate limiting under throttling
+            client = boto3.client(
+                service_name='bedrock-runtime',
+                region_name=self.region_name,
+                endpoint_url=self.endpoint_url,
+                config=Config(connect_timeout=self.connect_timeout,
+                              read_timeout=self.timeout,
+                              max_pool_connections=self.max_connections,
+                              retries={'mode': 'adaptive', 'total_max_attempts': 1})
+            )
+            print("[SUCCESS] Successfully initialized Bedrock client")
+            return client
+        except Exception as e:
+            print(f"[ERROR] Error initializing Bedrock client: {e}")
+            print(f"[ERROR] Error type: {type(e).__name__}")
+            print("[ERROR] Please check your AWS credentials and network connection")
+            raise
+
+
+# Word lists for the local generator's sentences
+SUBJECTS = ["My neighbor", "The teacher", "Our manager", "A young student", "The old fisherman",
+            "My sister", "The friendly driver", "Every visitor", "The tired nurse", "Her brother",
+            "The quiet librarian", "A curious child"]
+VERBS = ["carefully brought", "quickly found", "happily shared", "slowly carried", "proudly showed",
+         "nearly forgot", "gladly bought", "quietly fixed", "finally returned", "often borrows"]
+OBJECTS = ["three fresh loaves of bread", "a thick leather wallet", "the shiny silver kettle",
+           "several thin paper maps", "a bright yellow umbrella", "the heavy wooden chair",
+           "two warm woollen scarves", "a short birthday speech", "the broken bicycle bell",
+           "fifteen ripe strawberries", "a thoughtful thank-you letter"]
+PLACES = ["to the station", "before Thursday's lunch", "near the river bridge", "at the weekend market",
+          "after the long meeting", "through the crowded square", "in the early morning",
+          "behind the theatre", "during the storm", "from the northern village"]
+TIPS = ["Stress the first syllable of '{word}'.", "Keep the vowel in '{word}' long and clear.",
+        "Link '{word}' smoothly to the next word.", "Pronounce every consonant in '{word}'.",
+        "Say '{word}' slowly first, then at normal speed."]
+
+
+class LocalBackend:
+    """Deterministic offline stand-in for Bedrock with injectable failures
+
+    Answers sentence prompts with generated sentences in the same response
+    format as the real model, after a latency drawn from a configurable
+    distribution. A share of calls can be throttled, return malformed JSON
+    or be truncated. The outcome of a call depends only on the seed, the
+    request body and how often that body was sent before, so runs are
+    reproducible however worker threads interleave, and a retried request
+    gets a fresh outcome.
+
+    latency is a dict such as {"distribution": "lognormal", "median": 1.5,
+    "sigma": 0.5}, {"distribution": "uniform", "low": 0.5, "high": 2} or
+    {"distribution": "fixed", "seconds": 1}. model_latency maps model ids
+    to their own latency dict, to simulate a slow model next to a fast one.
+    """
+    def __init__(self, seed=0, latency=None, stream_chunk_chars=24, throttle_rate=0.0,
+                 malformed_rate=0.0, truncate_rate=0.0, sleep=time.sleep, model_latency=None):
+        self.seed = seed
+        self.latency = latency or {"distribution": "fixed", "seconds": 0}
+        self.model_latency = model_latency or {}
+        self.stream_chunk_chars = stream_chunk_chars
+        self.throttle_rate = throttle_rate
+        self.malformed_rate = malformed_rate
+        self.truncate_rate = truncate_rate
+        self.sleep = sleep
+        self.stats = {"calls": 0, "throttled": 0, "malformed": 0, "truncated": 0}
+        self._sent = {}  # Times each request body has been sent
+        self._lock = threading.Lock()
+
+    def warm_up(self):
+        pass
+
+    def invoke(self, model_id, body):
+        text, latency = self._respond(model_id, body)
+        self.sleep(latency)
+        return _wrap_text(model_id, text)
+
+    def open_stream(self, model_id, body):
+        text, latency = self._respond(model_id, body)
+        # A quarter of the latency passes before the first token, the rest spreads over the chunks
+        self.sleep(latency * 0.25)
+        return self._iter_chunks(model_id, text, latency * 0.75)
+
+    def _iter_chunks(self, model_id, text, duration):
+        size = self.stream_chunk_chars
+        chunks = [text[i:i + size] for i in range(0, len(text), size)] or [""]
+        for chunk in chunks:
+            self.sleep(duration / len(chunks))
+            yield _wrap_chunk(model_id, chunk)
+
+    def _respond(self, model_id, body):
+        """Decide the outcome of one call, returning the response text and its latency"""
+        key = hashlib.sha256(f"{model_id}\n{body}".encode("utf-8")).hexdigest()
+        with self._lock:
+            sent = self._sent.get(key, 0)
+            self._sent[key] = sent + 1
+            self.stats["calls"] += 1
+        rng = random.Random(f"{self.seed}:{key}:{sent}")
+        latency = self._sample_latency(rng, self.model_latency.get(model_id, self.latency))
+
+        if rng.random() < self.throttle_rate:
+            with self._lock:
+                self.stats["throttled"] += 1
+            # Throttling is reported quickly, without waiting for the model
+            self.sleep(latency * 0.1)
+            raise ClientError({"Error": {"Code": "ThrottlingException",
+                                         "Message": "Too many requests (local backend)"}}, "InvokeModel")
+
+        text = self._generate(_prompt_from_body(json.loads(body)), rng)
+        if rng.random() < self.malformed_rate:
+            text = self._malform(text, rng)
+            with self._lock:
+                self.stats["malformed"] += 1
+        if rng.random() < self.truncate_rate:
+            text = text[:int(len(text) * rng.uniform(0.3, 0.9))]
+            with self._lock:
+                self.stats["truncated"] += 1
+        return text, latency
+
+    def _sample_latency(self, rng, latency):
+        distribution = latency.get("distribution", "fixed")
+        if distribution == "lognormal":
+            return rng.lognormvariate(math.log(latency["median"]), latency.get("sigma", 0.5))
+        if distribution == "uniform":
+            return rng.uniform(latency["low"], latency["high"])
+        return latency.get("seconds", 0)
+
+    def _generate(self, prompt, rng):
+        """Answer a single level or batched sentence prompt in the format it asks for"""
+        batch = re.findall(r"Level (\d+): (\d+) sentences at (\w+) level, topics related to ([^,]+)", prompt)
+        if batch:
+            return json.dumps({level: self._sentences(int(count), difficulty, focus, rng)
+                               for level, count, difficulty, focus in batch}, indent=2)
+        match = re.search(r"Generate (\d+) English sentences.*? at (\w+) level\.\s*Focus on topics related to ([^.]+)",
+                          prompt, re.DOTALL)
+        if match:
+            count, difficulty, focus = match.groups()
+            return json.dumps(self._sentences(int(count), difficulty, focus, rng), indent=2)
+        return "I can only generate pronunciation practice sentences."
+
+    def _sentences(self, count, difficulty, focus, rng):
+        sentences = []
+        for _ in range(count):
+            words = [rng.choice(SUBJECTS), rng.choice(VERBS), rng.choice(OBJECTS)]
+            if difficulty != "easy":
+                words.append(rng.choice(PLACES))
+            if difficulty == "hard":
+                words.append("and " + rng.choice(PLACES))
+            sentence = " ".join(words) + "."
+            word = rng.choice([w for w in sentence.rstrip(".").split() if len(w) > 4] or ["clearly"])
+            sentences.append({"sentence": sentence,
+                              "context": f"Talking about {focus.strip()}",
+                              "pronunciation_tip": rng.choice(TIPS).format(word=word)})
+        return sentences
+
+    def _malform(self, text, rng):
+        """Break one object's JSON and wrap the response in chatty prose"""
+        quotes = [m.start() for m in re.finditer(r'"sentence": "', text)]
+        if quotes:
+            # Drop the opening quote of one sentence value
+            position = rng.choice(quotes) + len('"sentence": ')
+            text = text[:position] + text[position + 1:]
+        return "Here are your practice sentences:\n```json\n" + text + "\n```\nLet me know if you need more!"
+
+
+def _prompt_from_body(request):
+    """Find the prompt text in any of the supported request formats"""
+    if "messages" in request:
+        return request["messages"][0]["content"]
+    return request.get("prompt") or request.get("inputText") or ""
+
+
+def _wrap_text(model_id, text):
+    """Build a complete response body in the model's format"""
+    model_id = model_id.lower()
+    if "claude-3" in model_id:
+        return {"content": [{"type": "text", "text": text}]}
+    elif "claude-v2" in model_id:
+        return {"completion": text}
+    elif "amazon" in model_id:
+        return {"results": [{"outputText": text}]}
+    return {"generated_text": text}
+
+
+def _wrap_chunk(model_id, text):
+    """Build one streamed chunk in the model's format"""
+    model_id = model_id.lower()
+    if "claude-3" in model_id:
+        return {"type": "content_block_delta", "index": 0, "delta": {"type": "text_delta", "text": text}}
+    elif "claude-v2" in model_id:
+        return {"completion": text}
+    elif "amazon" in model_id:
+        return {"outputText": text}
+    return {"generated_text": text}
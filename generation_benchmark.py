@@ -0,0 +1,117 @@
+"""Offline load test for level generation.
+
+Runs initialize_levels against the deterministic LocalBackend instead of
+Bedrock, with configurable latency and failure injection, and reports how
+long the learner waits for the first sentence, the first level and all
+levels, plus how many calls, throttles and bad responses it took and how
+many responses the tolerant extractor recovered.
+
+    python generation_benchmark.py [--median 1.5] [--throttle-rate 0.2] [--malformed-rate 0.1]
+"""
+import os
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import argparse
+import json
+import time
+
+from pronunciation_master import PronunciationMaster
+from bedrock_client import BedrockClient
+from bedrock_transport import CircuitBreaker, RetryBudget
+from generation_backends import LocalBackend
+from model_router import ModelRouter
+from sentence_index import SentenceIndex
+from sentence_pool import SentencePool
+from config import *
+
+
+def run(backend, models=MODEL_CANDIDATES, hedging=MODEL_HEDGING, timeout=300):
+    """Generate every level through backend and return the timing summary"""
+    game = PronunciationMaster()
+    game.save_progress = lambda: None
+    game._bedrock_client = BedrockClient(
+        model_id=MODEL_ID,
+        timeout=GENERATION_TIMEOUT,
+        max_connections=GENERATION_MAX_WORKERS,
+        call_deadline=BEDROCK_CALL_DEADLINE,
+        max_attempts=BEDROCK_MAX_ATTEMPTS,
+        retry_budget=RetryBudget(BEDROCK_RETRY_BUDGET_RATIO),
+        circuit_breaker=CircuitBreaker(BEDROCK_BREAKER_THRESHOLD, BEDROCK_BREAKER_RESET),
+        backend=backend,
+        models=models,
+        router=ModelRouter(models, ROUTER_EWMA_ALPHA, ROUTER_MAX_ERROR_RATE,
+                           min_samples=HEDGE_MIN_SAMPLES),
+        hedging=hedging,
+    )
+    # Start from an empty history so runs are comparable
+    game._sentence_index = SentenceIndex(NEAR_DUPLICATE_THRESHOLD)
+    game._sentence_pool = SentencePool(None, FALLBACK_POOL_MAX_PER_LEVEL)
+
+    start = time.perf_counter()
+    first_sentence = first_level = None
+    game.initialize_levels(restart=True)
+    # Poll the shared state the way the main loop sees it
+    while time.perf_counter() - start < timeout:
+        elapsed = time.perf_counter() - start
+        if first_sentence is None and game.levels and game.levels[0].sentences:
+            first_sentence = elapsed
+        if first_level is None and game.levels and not game.levels[0].pending:
+            first_level = elapsed
+        if not game.generating_sentences:
+            break
+        time.sleep(0.01)
+    total = time.perf_counter() - start
+    game.stop_level_generation()
+
+    client = game.bedrock_client
+    return {
+        "first_sentence_seconds": first_sentence,
+        "first_level_seconds": first_level,
+        "all_levels_seconds": total,
+        "levels_ready": len(game.levels),
+        "sentences": sum(len(level.sentences) for level in game.levels),
+        "backend": dict(backend.stats),
+        "extraction": game.extraction_stats.as_dict(),
+        "near_duplicates_rejected": game.near_duplicates_rejected,
+        "retry_tokens_left": client.retry_budget.tokens,
+        "breaker_state": client.circuit_breaker.state,
+        "models": client.model_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline level generation load test")
+    parser.add_argument("--seed", type=int, default=MOCK_SEED)
+    parser.add_argument("--median", type=float, default=MOCK_LATENCY.get("median", 1.5),
+                        help="median call latency in seconds (lognormal)")
+    parser.add_argument("--sigma", type=float, default=MOCK_LATENCY.get("sigma", 0.5))
+    parser.add_argument("--throttle-rate", type=float, default=MOCK_THROTTLE_RATE)
+    parser.add_argument("--malformed-rate", type=float, default=MOCK_MALFORMED_RATE)
+    parser.add_argument("--truncate-rate", type=float, default=MOCK_TRUNCATE_RATE)
+    parser.add_argument("--models", default=",".join(MODEL_CANDIDATES), help="comma separated candidate models")
+    parser.add_argument("--backup-median", type=float,
+                        help="median latency of every model after the first, to simulate a faster or slower backup")
+    parser.add_argument("--hedging", action=argparse.BooleanOptionalAction, default=MODEL_HEDGING,
+                        help="send backup requests to the next model once a model's p95 latency is known")
+    parser.add_argument("--output", help="also write the summary to this JSON file")
+    args = parser.parse_args()
+
+    models = args.models.split(",")
+    model_latency = {}
+    if args.backup_median is not None:
+        model_latency = {model_id: {"distribution": "lognormal", "median": args.backup_median, "sigma": args.sigma}
+                         for model_id in models[1:]}
+    backend = LocalBackend(seed=args.seed,
+                           latency={"distribution": "lognormal", "median": args.median, "sigma": args.sigma},
+                           throttle_rate=args.throttle_rate, malformed_rate=args.malformed_rate,
+                           truncate_rate=args.truncate_rate, model_latency=model_latency)
+    summary = run(backend, models, args.hedging)
+    print(json.dumps(summary, indent=2))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(summary, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
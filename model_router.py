@@ -0,0 +1,107 @@
+import threading
+from collections import deque
+
+
+class ModelStats:
+    """Latency and error averages for one model and request size"""
+    def __init__(self, window):
+        self.latency = None        # EWMA of successful call latency in seconds
+        self.error_rate = 0.0      # EWMA of failures, 0 to 1
+        self.samples = deque(maxlen=window)  # Recent latencies for percentiles
+        self.calls = 0
+        self.errors = 0
+        self.hedges = 0            # Times a backup request was sent because this model was slow
+
+    def percentile(self, fraction):
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+class ModelRouter:
+    """Picks which candidate model serves each request
+
+    Every call updates an exponentially weighted moving average of latency
+    and error rate for its model. Requests go to the healthy model with the
+    lowest average latency; models not tried yet follow in configured order,
+    and models whose error rate reached max_error_rate come last. Stats are
+    kept per request size (max_tokens), since a batched request takes far
+    longer than a single level. hedge_delay() gives the p95 latency after
+    which a backup request to the next model is worthwhile. Until a model
+    has min_samples calls of that size its p95 is unknown, and it is not
+    hedged at all rather than on a guess.
+    """
+    def __init__(self, model_ids, alpha=0.3, max_error_rate=0.5, window=50,
+                 min_samples=5, hedge_quantile=0.95):
+        self.model_ids = list(model_ids)
+        self.alpha = alpha
+        self.max_error_rate = max_error_rate
+        self.window = window
+        self.min_samples = min_samples
+        self.hedge_quantile = hedge_quantile
+        self._stats = {}
+        self._lock = threading.Lock()
+
+    def _get(self, model_id, kind):
+        key = (model_id, kind)
+        if key not in self._stats:
+            self._stats[key] = ModelStats(self.window)
+        return self._stats[key]
+
+    def record(self, model_id, kind, latency=None, ok=True):
+        """Record a finished call, with its latency if it succeeded"""
+        with self._lock:
+            stats = self._get(model_id, kind)
+            stats.calls += 1
+            stats.error_rate = self.alpha * (0.0 if ok else 1.0) + (1 - self.alpha) * stats.error_rate
+            if not ok:
+                stats.errors += 1
+                return
+            stats.samples.append(latency)
+            if stats.latency is None:
+                stats.latency = latency
+            else:
+                stats.latency = self.alpha * latency + (1 - self.alpha) * stats.latency
+
+    def record_hedge(self, model_id, kind):
+        with self._lock:
+            self._get(model_id, kind).hedges += 1
+
+    def ranked(self, kind, exclude=()):
+        """Candidate models in the order they should be tried"""
+        with self._lock:
+            healthy, untried, unhealthy = [], [], []
+            for order, model_id in enumerate(self.model_ids):
+                if model_id in exclude:
+                    continue
+                stats = self._stats.get((model_id, kind))
+                if stats is not None and stats.error_rate >= self.max_error_rate:
+                    unhealthy.append((stats.error_rate, order, model_id))
+                elif stats is None or stats.latency is None:
+                    untried.append((order, model_id))
+                else:
+                    healthy.append((stats.latency, order, model_id))
+            return ([m for _, _, m in sorted(healthy)] + [m for _, m in untried]
+                    + [m for _, _, m in sorted(unhealthy)])
+
+    def hedge_delay(self, model_id, kind):
+        """Seconds to wait on a model before sending a backup request elsewhere, or None not to hedge"""
+        with self._lock:
+            stats = self._stats.get((model_id, kind))
+            if stats is None or len(stats.samples) < self.min_samples:
+                return None
+            return stats.percentile(self.hedge_quantile)
+
+    def snapshot(self):
+        """Per model and request size stats, for inspection"""
+        with self._lock:
+            result = {}
+            for (model_id, kind), stats in self._stats.items():
+                result.setdefault(model_id, {})[str(kind)] = {
+                    "ewma_latency": round(stats.latency, 3) if stats.latency is not None else None,
+                    "p95_latency": round(stats.percentile(0.95), 3) if stats.samples else None,
+                    "error_rate": round(stats.error_rate, 3),
+                    "calls": stats.calls,
+                    "errors": stats.errors,
+                    "hedges": stats.hedges,
+                }
+            return result
@@ -1,3 +1,4 @@
+import startup_profile
 import pygame
 import sys
 import os
@@ -5,16 +6,100 @@ import time
 import random
 import json
 import threading
-import uuid
-import speech_recognition as sr
-from gtts import gTTS
+from concurrent.futures import FIRST_COMPLETED, Future, wait
+from collections import OrderedDict
 from pygame import mixer
-from bedrock_client import BedrockClient
+from startup_profile import timed_import
+from fonts import get_font
+from sprites import load_image, to_display_format
+from text_layout import render_text
+from sentence_index import SentenceIndex
+from sentence_pool import SentencePool
+from audio_cache import AudioCache
+from audio_engine import AudioEngine, AudioPrefetcher
+from daemon_executor import DaemonThreadPoolExecutor
+from speech_synthesis import SYNTHESIZERS, SynthesizerRace
+from speech_input import MicrophoneSession, build_recognizers, display_text
+from sentence_parser import ExtractionStats, SentenceStreamParser, extract_grouped_sentences, extract_sentences
 from config import *
 
-class Button:
-    def __init__(self, x, y, width, height, text, color=LIGHT_BLUE):
+# speech_recognition, gtts and the Bedrock client (boto3) are imported on first
+# use or by the warm-up thread, so the start screen does not wait for them
+startup_profile.mark("module imports")
+
+# Level-specific configurations for sentence generation
+LEVEL_CONFIGS = {
+    1: {"difficulty": "easy", "focus": "basic greetings and introductions", 
+        "length": "5-7 words", "phonemes": "simple consonants and vowels"},
+    2: {"difficulty": "easy", "focus": "daily activities and routines", 
+        "length": "6-8 words", "phonemes": "th, r, l sounds"},
+    3: {"difficulty": "easy", "focus": "shopping and numbers", 
+        "length": "7-9 words", "phonemes": "s, z, sh sounds"},
+    4: {"difficulty": "medium", "focus": "work and education", 
+        "length": "8-10 words", "phonemes": "ch, j, v sounds"},
+    5: {"difficulty": "medium", "focus": "travel and directions", 
+        "length": "9-11 words", "phonemes": "w, y, compound sounds"},
+    6: {"difficulty": "medium", "focus": "food and dining", 
+        "length": "10-12 words", "phonemes": "diphthongs and blends"},
+    7: {"difficulty": "medium", "focus": "health and fitness", 
+        "length": "10-12 words", "phonemes": "consonant clusters"},
+    8: {"difficulty": "hard", "focus": "technology and science", 
+        "length": "11-13 words", "phonemes": "complex consonant clusters"},
+    9: {"difficulty": "hard", "focus": "business and economics", 
+        "length": "12-14 words", "phonemes": "stress patterns and rhythm"},
+    10: {"difficulty": "hard", "focus": "arts, culture and philosophy", 
+         "length": "13-15 words", "phonemes": "advanced pronunciation patterns"}
+}
+
+# Used for levels without a specific configuration
+DEFAULT_LEVEL_CONFIG = {
+    "difficulty": "medium",
+    "focus": "general topics",
+    "length": "8-12 words",
+    "phonemes": "mixed sounds"
+}
+
+# Number of distinct status pills kept pre-rendered
+STATUS_SPRITE_CACHE_SIZE = 16
+
+# Posted by background threads to wake the main loop while it is idle
+WAKE_EVENT = pygame.USEREVENT + 1
+# Posted by the mixer when a sentence finishes playing, the main loop then opens the microphone
+AUDIO_END_EVENT = pygame.USEREVENT + 2
+# Timer events waking the main loop once a wait for a level or a sentence reaches LEVEL_DEADLINE.
+# Each wait has its own event type, as arming a pygame timer cancels the previous one for that type
+LEVEL_DEADLINE_EVENT = pygame.USEREVENT + 3
+SENTENCE_DEADLINE_EVENT = pygame.USEREVENT + 4
+
+def wake_main_loop():
+    """Wake the main loop if called from a background thread"""
+    if threading.current_thread() is threading.main_thread():
+        return
+    try:
+        pygame.event.post(pygame.event.Event(WAKE_EVENT))
+    except pygame.error:
+        pass  # Event system not initialized
+
+class Widget:
+    """Base class for screen elements that track whether they need redrawing"""
+    def __init__(self, x, y, width, height):
         self.rect = pygame.Rect(x, y, width, height)
+        self.dirty = True
+        # Widgets that change every frame set this to keep the loop at full frame rate
+        self.animating = False
+        
+    def mark_dirty(self):
+        self.dirty = True
+        wake_main_loop()
+        
+    @property
+    def bounds(self):
+        """Screen area covered by the widget, including any shadow"""
+        return self.rect
+
+class Button(Widget):
+    def __init__(self, x, y, width, height, text, color=LIGHT_BLUE):
+        super().__init__(x, y, width, height)
         self.text = text
         self.color = color
         
@@ -27,265 +112,280 @@ class Button:
         )
         
         # Bold, modern system font
-        self.font = pygame.font.SysFont('Arial', 20, bold=True)
+        self.font = get_font('Arial', 20, bold=True)
         
         self.is_hovered = False
         self.enabled = True
+        
+        # Pre-rendered button images for each state
+        self._sprites = {}
 
+    @property
+    def bounds(self):
+        return self.rect.union(self.rect.move(4, 4))
         
-    def draw(self, screen):
-        # Define button colors based on state
-        if not self.enabled:
-            base_color = GRAY
-        elif self.is_hovered:
-            base_color = self.hover_color
-        else:
-            base_color = self.color
+    def set_text(self, text):
+        if text != self.text:
+            self.text = text
+            self._sprites = {}
+            self.mark_dirty()
+            
+    def set_enabled(self, enabled):
+        if enabled != self.enabled:
+            self.enabled = enabled
+            self.is_hovered = self.is_hovered and enabled
+            self.mark_dirty()
+        
+    def _render_sprite(self, base_color):
+        """Render the button with its shadow onto a transparent surface"""
+        shadow_offset = 4
+        surface = pygame.Surface((self.rect.width + shadow_offset, self.rect.height + shadow_offset),
+                                 pygame.SRCALPHA)
+        button_rect = pygame.Rect(0, 0, self.rect.width, self.rect.height)
 
         # Draw subtle shadow
-        shadow_offset = 4
-        shadow_rect = pygame.Rect(self.rect.x + shadow_offset, self.rect.y + shadow_offset,
-                                self.rect.width, self.rect.height)
-        pygame.draw.rect(screen, DARK_GRAY, shadow_rect, border_radius=12)
+        pygame.draw.rect(surface, DARK_GRAY, button_rect.move(shadow_offset, shadow_offset), border_radius=12)
 
         # Draw button background
-        pygame.draw.rect(screen, base_color, self.rect, border_radius=12)
+        pygame.draw.rect(surface, base_color, button_rect, border_radius=12)
 
         # Draw text centered in button
-        font = pygame.font.SysFont('Arial', 20, bold=True)
-        text_surface = font.render(self.text, True, WHITE)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
-
-
+        text_surface = self.font.render(self.text, True, WHITE)
+        text_rect = text_surface.get_rect(center=button_rect.center)
+        surface.blit(text_surface, text_rect)
+        return to_display_format(surface)
+        
+    def draw(self, screen):
+        # Pick the button image for the current state
+        if not self.enabled:
+            state, base_color = "disabled", GRAY
+        elif self.is_hovered:
+            state, base_color = "hover", self.hover_color
+        else:
+            state, base_color = "normal", self.color
+            
+        sprite = self._sprites.get(state)
+        if sprite is None:
+            sprite = self._sprites[state] = self._render_sprite(base_color)
+        screen.blit(sprite, self.rect.topleft)
         
     def check_hover(self, mouse_pos):
-        self.is_hovered = self.rect.collidepoint(mouse_pos) and self.enabled
+        hovered = self.rect.collidepoint(mouse_pos) and self.enabled
+        if hovered != self.is_hovered:
+            self.is_hovered = hovered
+            self.mark_dirty()
         return self.is_hovered
         
     def is_clicked(self, mouse_pos, mouse_click):
         return self.rect.collidepoint(mouse_pos) and mouse_click and self.enabled
 
-class Character:
+class Character(Widget):
     def __init__(self, name, image_path, x, y, width, height):
+        super().__init__(x, y, width, height)
         self.name = name
         try:
-            self.image = pygame.image.load(image_path) if os.path.exists(image_path) else None
-            if self.image:
-                self.image = pygame.transform.scale(self.image, (width, height))
+            self.image = load_image(image_path, (width, height)) if os.path.exists(image_path) else None
         except Exception as e:
             print(f"Error loading image {image_path}: {e}")
             self.image = None
-        self.rect = pygame.Rect(x, y, width, height)
         self.speaking = False
         
-    def draw(self, screen):
+        # Pre-rendered character images, with and without the speaking indicator
+        self._sprites = {}
+        
+    def set_speaking(self, speaking):
+        if speaking != self.speaking:
+            self.speaking = speaking
+            self.mark_dirty()
+        
+    def _render_sprite(self, speaking):
+        """Render the character, or its placeholder, with the optional speaking indicator"""
+        surface = pygame.Surface(self.rect.size, pygame.SRCALPHA)
         if self.image:
             # Draw character image
-            screen.blit(self.image, self.rect)
+            surface.blit(self.image, (0, 0))
         else:
             # Draw a modern placeholder with rounded corners
-            placeholder_surf = pygame.Surface(self.rect.size, pygame.SRCALPHA)
-            pygame.draw.rect(placeholder_surf, GRAY, placeholder_surf.get_rect(), border_radius=15)
-            screen.blit(placeholder_surf, self.rect.topleft)
+            pygame.draw.rect(surface, GRAY, surface.get_rect(), border_radius=15)
             
             # Draw character name
-            font = pygame.font.SysFont("Arial", 20, bold=True)
+            font = get_font("Arial", 20, bold=True)
             text = font.render(self.name, True, WHITE)
-            text_rect = text.get_rect(center=self.rect.center)
-            screen.blit(text, text_rect)
+            text_rect = text.get_rect(center=surface.get_rect().center)
+            surface.blit(text, text_rect)
 
         # Draw speaking indicator — glowing pulsing circle style
-        if self.speaking:
+        if speaking:
             indicator_radius = 12
-            indicator_pos = (self.rect.right - 20, self.rect.top + 20)
-            pygame.draw.circle(screen, LIGHT_BLUE, indicator_pos, indicator_radius)
-            pygame.draw.circle(screen, WHITE, indicator_pos, indicator_radius, 2)
+            indicator_pos = (self.rect.width - 20, 20)
+            pygame.draw.circle(surface, LIGHT_BLUE, indicator_pos, indicator_radius)
+            pygame.draw.circle(surface, WHITE, indicator_pos, indicator_radius, 2)
+        return to_display_format(surface)
+        
+    def draw(self, screen):
+        sprite = self._sprites.get(self.speaking)
+        if sprite is None:
+            sprite = self._sprites[self.speaking] = self._render_sprite(self.speaking)
+        screen.blit(sprite, self.rect.topleft)
 
 
-class SentenceDisplay:
+class SentenceDisplay(Widget):
     def __init__(self, x, y, width, height):
-        self.rect = pygame.Rect(x, y, width, height)
+        super().__init__(x, y, width, height)
         self.sentence = ""
-        self.font = pygame.font.Font(None, 36)
+        self.font = get_font(None, 36)
         self.context = ""
-        self.small_font = pygame.font.Font(None, 24)
+        self.small_font = get_font(None, 24)
+        self._layout_key = None
+        self._blits = []
         
     def set_sentence(self, sentence, context=""):
         self.sentence = sentence
         self.context = context
+        self.mark_dirty()
         
-    def draw(self, screen):
-        # Draw box
-        pygame.draw.rect(screen, DARK_GRAY, self.rect, border_radius=15)
-        pygame.draw.rect(screen, LIGHT_BLUE, self.rect, 2, border_radius=15)
-        
-        # Draw sentence with improved word wrapping
-        words = self.sentence.split(' ')
-        line = ""
+    def _layout(self):
+        """Wrap and render the sentence and context, reusing the previous layout if unchanged"""
+        key = (self.sentence, self.context)
+        if key == self._layout_key:
+            return self._blits
+            
+        blits = []
         y_offset = 20
         max_width = self.rect.width - 40
         
-        for word in words:
-            test_line = line + word + " "
-            test_width = self.font.size(test_line)[0]
-            
-            if test_width > max_width:
-                # If a single word is too long, break it
-                if not line and self.font.size(word)[0] > max_width:
-                    # Split the long word
-                    curr_word = word
-                    while curr_word:
-                        for i in range(len(curr_word), 0, -1):
-                            part = curr_word[:i]
-                            if self.font.size(part)[0] <= max_width:
-                                text_surface = self.font.render(part, True, WHITE)
-                                screen.blit(text_surface, (self.rect.x + 20, self.rect.y + y_offset))
-                                y_offset += 40
-                                curr_word = curr_word[i:]
-                                break
-                else:
-                    text_surface = self.font.render(line, True, WHITE)
-                    screen.blit(text_surface, (self.rect.x + 20, self.rect.y + y_offset))
-                    y_offset += 40
-                    line = word + " "
-            else:
-                line = test_line
-                
-        if line:
-            text_surface = self.font.render(line, True, WHITE)
-            screen.blit(text_surface, (self.rect.x + 20, self.rect.y + y_offset))
+        # Sentence lines
+        for surface in render_text(self.font, self.sentence, max_width, WHITE):
+            blits.append((surface, (self.rect.x + 20, self.rect.y + y_offset)))
             y_offset += 40
-        
-        # Draw context if available
+            
+        # Context lines if available
         if self.context:
-            # Handle long context with wrapping
             context_text = f"Context: {self.context}"
-            words = context_text.split(' ')
-            line = ""
-            max_width = self.rect.width - 40
-            
-            for word in words:
-                test_line = line + word + " "
-                test_width = self.small_font.size(test_line)[0]
+            for surface in render_text(self.small_font, context_text, max_width, LIGHT_BLUE):
+                blits.append((surface, (self.rect.x + 20, self.rect.y + y_offset)))
+                y_offset += 25
                 
-                if test_width > max_width:
-                    context_surface = self.small_font.render(line, True, LIGHT_BLUE)
-                    screen.blit(context_surface, (self.rect.x + 20, self.rect.y + y_offset))
-                    y_offset += 25
-                    line = word + " "
-                else:
-                    line = test_line
-                    
-            if line:
-                context_surface = self.small_font.render(line, True, LIGHT_BLUE)
-                screen.blit(context_surface, (self.rect.x + 20, self.rect.y + y_offset))
+        self._layout_key = key
+        self._blits = blits
+        return blits
+        
+    def draw(self, screen):
+        # Draw box
+        pygame.draw.rect(screen, DARK_GRAY, self.rect, border_radius=15)
+        pygame.draw.rect(screen, LIGHT_BLUE, self.rect, 2, border_radius=15)
+        
+        # Blit the cached text layout
+        screen.blits(self._layout(), doreturn=False)
 
-class FeedbackDisplay:
+class FeedbackDisplay(Widget):
     def __init__(self, x, y, width, height):
-        self.rect = pygame.Rect(x, y, width, height)
+        super().__init__(x, y, width, height)
         self.text = ""
-        self.font = pygame.font.Font(None, FONT_SIZE)
+        self.font = get_font(None, FONT_SIZE)
         self.color = WHITE
         self.correct_pronunciation = ""
+        self._layout_key = None
+        self._blits = []
         
     def set_feedback(self, text, correct_pronunciation="", success=True):
+        color = GREEN if success else RED
+        if (text, correct_pronunciation, color) == (self.text, self.correct_pronunciation, self.color):
+            return
         self.text = text
         self.correct_pronunciation = correct_pronunciation
-        self.color = GREEN if success else RED
+        self.color = color
+        self.mark_dirty()
         
-    def draw(self, screen):
-        if not self.text:
-            return
-            
-        # Draw box with rounded corners
-        pygame.draw.rect(screen, DARK_GRAY, self.rect, border_radius=15)
-        pygame.draw.rect(screen, self.color, self.rect, 2, border_radius=15)
+    def clear(self):
+        self.text = ""
+        self.correct_pronunciation = ""
+        self.mark_dirty()
         
-        # Draw text with improved word wrapping
-        words = self.text.split(' ')
-        line = ""
+    def _layout(self):
+        """Wrap and render the feedback and tip, reusing the previous layout if unchanged"""
+        key = (self.text, self.correct_pronunciation, self.color)
+        if key == self._layout_key:
+            return self._blits
+            
+        blits = []
         y_offset = 20
         max_width = self.rect.width - 40
         
-        for word in words:
-            test_line = line + word + " "
-            test_width = self.font.size(test_line)[0]
-            
-            if test_width > max_width:
-                # If a single word is too long, break it
-                if not line and self.font.size(word)[0] > max_width:
-                    # Split the long word
-                    curr_word = word
-                    while curr_word:
-                        for i in range(len(curr_word), 0, -1):
-                            part = curr_word[:i]
-                            if self.font.size(part)[0] <= max_width:
-                                text_surface = self.font.render(part, True, self.color)
-                                screen.blit(text_surface, (self.rect.x + 20, self.rect.y + y_offset))
-                                y_offset += 30
-                                curr_word = curr_word[i:]
-                                break
-                else:
-                    text_surface = self.font.render(line, True, self.color)
-                    screen.blit(text_surface, (self.rect.x + 20, self.rect.y + y_offset))
-                    y_offset += 30
-                    line = word + " "
-            else:
-                line = test_line
-                
-        if line:
-            text_surface = self.font.render(line, True, self.color)
-            screen.blit(text_surface, (self.rect.x + 20, self.rect.y + y_offset))
+        # Feedback lines
+        for surface in render_text(self.font, self.text, max_width, self.color):
+            blits.append((surface, (self.rect.x + 20, self.rect.y + y_offset)))
             y_offset += 30
             
-        # Draw correct pronunciation if available with wrapping
+        # Correct pronunciation lines if available
         if self.correct_pronunciation:
             tip_text = f"Pronunciation tip: {self.correct_pronunciation}"
-            words = tip_text.split(' ')
-            line = ""
-            
-            for word in words:
-                test_line = line + word + " "
-                test_width = self.font.size(test_line)[0]
+            for surface in render_text(self.font, tip_text, max_width, WHITE):
+                blits.append((surface, (self.rect.x + 20, self.rect.y + y_offset)))
+                y_offset += 30
                 
-                if test_width > max_width:
-                    correct_surface = self.font.render(line, True, WHITE)
-                    screen.blit(correct_surface, (self.rect.x + 20, self.rect.y + y_offset))
-                    y_offset += 30
-                    line = word + " "
-                else:
-                    line = test_line
-                    
-            if line:
-                correct_surface = self.font.render(line, True, WHITE)
-                screen.blit(correct_surface, (self.rect.x + 20, self.rect.y + y_offset))
+        self._layout_key = key
+        self._blits = blits
+        return blits
+        
+    def draw(self, screen):
+        if not self.text:
+            return
+            
+        # Draw box with rounded corners
+        pygame.draw.rect(screen, DARK_GRAY, self.rect, border_radius=15)
+        pygame.draw.rect(screen, self.color, self.rect, 2, border_radius=15)
+        
+        # Blit the cached text layout
+        screen.blits(self._layout(), doreturn=False)
 
-class StatusDisplay:
+class StatusDisplay(Widget):
     def __init__(self, x, y, width, height):
-        self.rect = pygame.Rect(x, y, width, height)
+        super().__init__(x, y, width, height)
         self.status = "Ready"
-        self.font = pygame.font.SysFont("Arial", 22, bold=True)
+        self.font = get_font("Arial", 22, bold=True)
         self.padding = 10
+        
+        # Pre-rendered status pills, most recently used last
+        self._sprites = OrderedDict()
+
+    @property
+    def bounds(self):
+        return self.rect.union(self.rect.move(3, 3))
 
     def set_status(self, status):
-        self.status = status
+        if status != self.status:
+            self.status = status
+            self.mark_dirty()
 
-    def draw(self, screen):
+    def _render_sprite(self, status):
+        """Render the status pill with its shadow onto a transparent surface"""
+        surface = pygame.Surface((self.rect.width + 3, self.rect.height + 3), pygame.SRCALPHA)
+        pill_rect = pygame.Rect(0, 0, self.rect.width, self.rect.height)
+        
         # Draw shadow for modern depth effect
-        shadow_rect = self.rect.copy()
-        shadow_rect.x += 3
-        shadow_rect.y += 3
-        pygame.draw.rect(screen, (30, 30, 30), shadow_rect, border_radius=12)
+        pygame.draw.rect(surface, (30, 30, 30), pill_rect.move(3, 3), border_radius=12)
 
         # Draw background with border
-        pygame.draw.rect(screen, DARK_GRAY, self.rect, border_radius=12)
-        pygame.draw.rect(screen, LIGHT_BLUE, self.rect, 2, border_radius=12)
+        pygame.draw.rect(surface, DARK_GRAY, pill_rect, border_radius=12)
+        pygame.draw.rect(surface, LIGHT_BLUE, pill_rect, 2, border_radius=12)
 
         # Render and center the text
-        text_surface = self.font.render(self.status, True, WHITE)
-        text_rect = text_surface.get_rect(center=self.rect.center)
-        screen.blit(text_surface, text_rect)
+        text_surface = self.font.render(status, True, WHITE)
+        text_rect = text_surface.get_rect(center=pill_rect.center)
+        surface.blit(text_surface, text_rect)
+        return to_display_format(surface)
+
+    def draw(self, screen):
+        status = self.status
+        sprite = self._sprites.get(status)
+        if sprite is None:
+            sprite = self._sprites[status] = self._render_sprite(status)
+            if len(self._sprites) > STATUS_SPRITE_CACHE_SIZE:
+                self._sprites.popitem(last=False)
+        else:
+            self._sprites.move_to_end(status)
+        screen.blit(sprite, self.rect.topleft)
 
 
 class Level:
@@ -298,6 +398,7 @@ class Level:
         self.total_attempts = 0
         self.required_score = 70  # 70% to pass
         self.current_index = 0  # Track current position in sentences
+        self.pending = 0  # Sentences still being streamed in for this level
         
     def is_completed(self):
         return self.get_completion_percentage() >= self.required_score
@@ -327,22 +428,26 @@ class Level:
             self.completed_sentences.add(sentence)
             # Calculate score based on completed sentences and total sentences
             # Each sentence is worth exactly 20% (for 5 sentences)
-            self.score = (len(self.completed_sentences) / len(self.sentences)) * 100
+            total = len(self.sentences) + self.pending
+            self.score = (len(self.completed_sentences) / total) * 100
             # Print debug info
-            print(f"Completed: {len(self.completed_sentences)}/{len(self.sentences)} sentences")
+            print(f"Completed: {len(self.completed_sentences)}/{total} sentences")
         self.total_attempts += 1
         
     def get_progress(self):
-        return len(self.completed_sentences), len(self.sentences)
+        return len(self.completed_sentences), len(self.sentences) + self.pending
         
     def get_completion_percentage(self):
         # Calculate percentage directly from completed sentences
-        if not self.sentences:
+        completed, total = self.get_progress()
+        if not total:
             return 0
-        return min((len(self.completed_sentences) / len(self.sentences)) * 100, 100)  # Cap at 100%
+        return min((completed / total) * 100, 100)  # Cap at 100%
 
 class PronunciationMaster:
     def __init__(self):
+        # A small mixer buffer starts playback sooner, it has to be set before pygame.init
+        mixer.pre_init(buffer=AUDIO_BUFFER_SIZE)
         pygame.init()
         try:
             mixer.init()
@@ -351,6 +456,7 @@ class PronunciationMaster:
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption(WINDOW_TITLE)
         self.clock = pygame.time.Clock()
+        startup_profile.mark("pygame init")
         
         # Create character
         char_width, char_height = CHARACTER_WIDTH, CHARACTER_HEIGHT
@@ -370,7 +476,7 @@ class PronunciationMaster:
         # Create buttons
         self.toggle_button = Button(WINDOW_WIDTH // 2 - 200, 500, 180, 40, "Pause Auto Mode")
         self.next_level_button = Button(WINDOW_WIDTH // 2 + 20, 500, 180, 40, "Next Level")
-        self.next_level_button.enabled = False
+        self.next_level_button.set_enabled(False)
         
         # Start screen buttons
         self.resume_button = Button(WINDOW_WIDTH // 2 - 100, 250, 200, 50, "Resume Latest Level", BLUE)
@@ -378,14 +484,39 @@ class PronunciationMaster:
         self.toggle_dynamic_button = Button(WINDOW_WIDTH // 2 - 100, 390, 200, 50, 
                                           "Dynamic: " + ("ON" if USE_DYNAMIC_SENTENCES else "OFF"), LIGHT_BLUE)
         
-        # Initialize speech recognizer
-        self.recognizer = sr.Recognizer()
+        # Position start screen buttons neatly
+        button_spacing = 80
+        base_y = 280
+        self.resume_button.rect.center = (WINDOW_WIDTH // 2, base_y)
+        self.restart_button.rect.center = (WINDOW_WIDTH // 2, base_y + button_spacing)
+        self.toggle_dynamic_button.rect.center = (WINDOW_WIDTH // 2, base_y + button_spacing * 2)
         
-        # Initialize Bedrock client
-        self.bedrock_client = BedrockClient(
-            model_id=MODEL_ID,
-            region_name=AWS_REGION,
-        )
+        # Widgets redrawn through damage tracking on each screen
+        self.start_widgets = [self.resume_button, self.restart_button, self.toggle_dynamic_button]
+        self.game_widgets = [self.guide, self.sentence_display, self.feedback_display,
+                             self.status_display, self.toggle_button, self.next_level_button]
+        self.level_info_rect = pygame.Rect(0, 0, WINDOW_WIDTH, 90)
+        self.drawn_screen = None
+        self.drawn_level_info = None
+        
+        startup_profile.mark("widgets")
+        
+        # The speech recognizer and Bedrock client are created on first use
+        self._recognizer = None
+        self._microphone = None
+        self._speech_recognizer = None
+        self._bedrock_client = None
+        self._sentence_index = None
+        self._sentence_pool = None
+        self._audio_engine = None
+        # Synthesizes the sentences coming up next, so playback after an answer starts without waiting
+        self.audio_prefetcher = AudioPrefetcher(
+            lambda text: self.audio_engine.load(text, TTS_LANG, TTS_SLOW), PREFETCH_WORKERS)
+        # One lock per lazily built client, so building a slow one (boto3, the sentence
+        # history) in the warm-up thread never holds up the others
+        self.client_locks = {name: threading.Lock() for name in (
+            "recognizer", "speech_recognizer", "microphone", "bedrock_client",
+            "sentence_index", "sentence_pool", "audio_engine")}
         
         # Game state
         self.current_level = 0
@@ -398,13 +529,155 @@ class PronunciationMaster:
         self.auto_mode = True
         self.auto_listening = False
         self.generating_sentences = False
+        self.generation_executor = None
+        self.generation_stopped = threading.Event()
+        self.pending_level = None  # Index of a level the learner is waiting on
+        self.waiting_for_sentence = False  # Current level is still streaming in sentences
+        # When the learner started waiting, levels and sentences are filled from the pool after LEVEL_DEADLINE
+        self.pending_since = None
+        self.waiting_since = None
+        self.fallback_levels = set()  # Level numbers filled from the pool, their late results refill it
+        self.fallback_waker = Future()  # Resolved to wake the generator when a level is filled from the pool
+        self.levels_lock = threading.Lock()
+        self.save_lock = threading.Lock()
         self.game_started = False
         self.has_saved_progress = os.path.exists("pronunciation_progress.json")
         self.used_sentences = set()  # Track all used sentences across levels
+        self.extraction_stats = ExtractionStats()  # What the tolerant JSON extractor recovered
+        self.near_duplicates_rejected = 0
+        self.rejected_lock = threading.Lock()  # Generation and streaming threads both count rejections
         self.use_dynamic_sentences = USE_DYNAMIC_SENTENCES  # Use dynamic sentence generation
         
         # Load levels but don't start yet
         self.preload_levels()
+        startup_profile.mark("preload levels")
+        
+    @property
+    def recognizer(self):
+        """Speech recognizer, importing speech_recognition on first use"""
+        with self.client_locks["recognizer"]:
+            if self._recognizer is None:
+                self._recognizer = timed_import("speech_recognition").Recognizer()
+            return self._recognizer
+            
+    @property
+    def speech_recognizer(self):
+        """Speech-to-text backends, the offline one first when its model is installed"""
+        recognizer = self.recognizer
+        with self.client_locks["speech_recognizer"]:
+            if self._speech_recognizer is None:
+                self._speech_recognizer = build_recognizers(SPEECH_RECOGNIZERS, recognizer, VOSK_MODEL_PATH)
+                print(f"[INFO] Speech recognizers: {', '.join(self._speech_recognizer.names)}")
+            return self._speech_recognizer
+            
+    @property
+    def microphone(self):
+        """Microphone stream kept open and calibrated for the whole session"""
+        recognizer = self.recognizer
+        with self.client_locks["microphone"]:
+            if self._microphone is None:
+                self._microphone = MicrophoneSession(
+                    recognizer, MIC_CALIBRATION_SECONDS, MIC_RECALIBRATION_SECONDS, MIC_RECALIBRATE_INTERVAL,
+                    PHRASE_TIME_LIMIT, can_calibrate=lambda: not self.playing_audio and not self.auto_listening)
+            return self._microphone
+            
+    @property
+    def bedrock_client(self):
+        """Bedrock client, importing boto3 and building the client on first use"""
+        with self.client_locks["bedrock_client"]:
+            if self._bedrock_client is None:
+                BedrockClient = timed_import("bedrock_client").BedrockClient
+                transport = timed_import("bedrock_transport")
+                ModelRouter = timed_import("model_router").ModelRouter
+                backend = None
+                if USE_MOCK:
+                    backend = timed_import("generation_backends").LocalBackend(
+                        seed=MOCK_SEED, latency=MOCK_LATENCY, throttle_rate=MOCK_THROTTLE_RATE,
+                        malformed_rate=MOCK_MALFORMED_RATE, truncate_rate=MOCK_TRUNCATE_RATE,
+                        model_latency=MOCK_MODEL_LATENCY)
+                    print("[INFO] Using the local generation backend")
+                self._bedrock_client = BedrockClient(
+                    model_id=MODEL_ID,
+                    region_name=AWS_REGION,
+                    timeout=GENERATION_TIMEOUT,
+                    max_connections=GENERATION_MAX_WORKERS,
+                    use_dynamic=self.use_dynamic_sentences,
+                    # Local responses are not worth keeping
+                    cache_path=None if USE_MOCK else RESPONSE_CACHE_PATH,
+                    cache_max_entries=RESPONSE_CACHE_MAX_ENTRIES,
+                    cache_ttl=RESPONSE_CACHE_TTL,
+                    connect_timeout=BEDROCK_CONNECT_TIMEOUT,
+                    call_deadline=BEDROCK_CALL_DEADLINE,
+                    max_attempts=BEDROCK_MAX_ATTEMPTS,
+                    endpoint_url=BEDROCK_ENDPOINT_URL,
+                    retry_budget=transport.RetryBudget(BEDROCK_RETRY_BUDGET_RATIO),
+                    circuit_breaker=transport.CircuitBreaker(BEDROCK_BREAKER_THRESHOLD, BEDROCK_BREAKER_RESET),
+                    backend=backend,
+                    models=MODEL_CANDIDATES,
+                    router=ModelRouter(MODEL_CANDIDATES, ROUTER_EWMA_ALPHA, ROUTER_MAX_ERROR_RATE,
+                                       min_samples=HEDGE_MIN_SAMPLES),
+                    hedging=MODEL_HEDGING,
+                )
+                # The dynamic toggle does not wait for this lock, pick up a change made meanwhile
+                self._bedrock_client.use_dynamic = self.use_dynamic_sentences
+            return self._bedrock_client
+            
+    @property
+    def sentence_index(self):
+        """Near-duplicate index of every sentence used so far, loaded from the history on first use"""
+        with self.client_locks["sentence_index"]:
+            if self._sentence_index is None:
+                # Sentences from the local backend are not worth remembering
+                self._sentence_index = SentenceIndex(NEAR_DUPLICATE_THRESHOLD,
+                                                     path=None if USE_MOCK else SENTENCE_HISTORY_PATH,
+                                                     max_entries=SENTENCE_HISTORY_MAX)
+            return self._sentence_index
+            
+    @property
+    def sentence_pool(self):
+        """Previously generated sentences for filling levels without waiting"""
+        with self.client_locks["sentence_pool"]:
+            if self._sentence_pool is None:
+                self._sentence_pool = SentencePool(None if USE_MOCK else FALLBACK_POOL_PATH,
+                                                   FALLBACK_POOL_MAX_PER_LEVEL)
+            return self._sentence_pool
+            
+    @property
+    def audio_engine(self):
+        """Decoded sentence audio in memory, backed by the disk cache so replays do not go back to gTTS"""
+        with self.client_locks["audio_engine"]:
+            if self._audio_engine is None:
+                # gTTS is preferred, a local engine covers for it when the network is slow
+                race = SynthesizerRace([SYNTHESIZERS[name](timeout=TTS_REQUEST_TIMEOUT) for name in TTS_ENGINES],
+                                       TTS_RACE_DEADLINE, timeout=TTS_TIMEOUT)
+                print(f"[INFO] Text-to-speech engines: {', '.join(race.names)}")
+                self._audio_engine = AudioEngine(race,
+                                                 AudioCache(TTS_CACHE_DIR, TTS_CACHE_MAX_BYTES),
+                                                 AUDIO_MEMORY_MAX_BYTES, AUDIO_END_EVENT)
+            return self._audio_engine
+        
+    def start_warm_up(self, on_done=None):
+        """Load heavy modules and the Bedrock client in the background after the first frame"""
+        def warm_up():
+            try:
+                timed_import("gtts")
+                # Open and calibrate the microphone now, so the first attempt does not wait for it
+                self.microphone.start()
+                self.speech_recognizer
+                self.sentence_index
+                self.sentence_pool
+                self.audio_engine
+                client = self.bedrock_client
+                if self.use_dynamic_sentences:
+                    # Resolve credentials and build the boto3 client before the first request
+                    client.warm_up()
+                startup_profile.mark("warm-up")
+            except Exception as e:
+                print(f"[ERROR] Warm-up failed, modules will load on first use: {e}")
+            if on_done:
+                on_done()
+                
+        threading.Thread(target=warm_up, name="warm-up", daemon=True).start()
         
     def preload_levels(self):
         """Preload levels without starting the game"""
@@ -417,79 +690,478 @@ class PronunciationMaster:
         # This ensures we get fresh sentences from Bedrock each time
         if restart or not self.levels:
             self.levels = []
-            # Track all used sentences to avoid repetition across levels
-            used_sentences = set()
+            self.current_level = 0
+            self.fallback_levels = set()
+            
+            # Generate all levels in the background and start as soon as level 1 is ready
+            self.start_level_generation(range(1, LEVEL_COUNT + 1))
+            self.wait_for_level(0)
+            self.game_started = True
+            return
+            
+        # Start the game
+        self.game_started = True
+        self.next_sentence()
+        
+    def resume_level_generation(self):
+        """Continue generating levels that were not finished before the last quit
+        
+        Besides the levels after the last one saved, this requeues levels saved
+        while still streaming in, which are filled up in place, and levels
+        ahead of the learner that an earlier run skipped.
+        """
+        with self.levels_lock:
+            saved = {level.level_num for level in self.levels}
+            last_level = max(saved, default=0)
+            ahead = self.levels[self.current_level:]
+            partial_levels = {}
+            for level in ahead:
+                if len(level.sentences) < SENTENCES_PER_LEVEL:
+                    level.pending = SENTENCES_PER_LEVEL - len(level.sentences)
+                    partial_levels[level.level_num] = level
+        first_ahead = ahead[0].level_num if ahead else last_level + 1
+        missing = [n for n in range(first_ahead, LEVEL_COUNT + 1) if n not in saved]
+        level_nums = sorted(set(partial_levels) | set(missing))
+        if level_nums:
+            if partial_levels:
+                print(f"[INFO] Filling up levels {', '.join(map(str, sorted(partial_levels)))} saved before they were complete")
+            used_sentences = {s["sentence"] for level in self.levels for s in level.sentences}
+            self.start_level_generation(level_nums, used_sentences, partial_levels)
+            
+    def start_level_generation(self, level_nums, used_sentences=None, partial_levels=None):
+        """Generate levels in a background thread, adding each one as soon as it is ready
+        
+        partial_levels maps level numbers to levels already in self.levels
+        that are short of sentences; generation fills those up instead.
+        """
+        self.generating_sentences = True
+        self.generation_stopped.clear()
+        partial_levels = partial_levels or {}
+        
+        def generate():
+            try:
+                for level in self.iter_generated_levels(level_nums, used_sentences, partial_levels):
+                    if self.generation_stopped.is_set():
+                        break
+                    with self.levels_lock:
+                        if level.level_num in self.fallback_levels:
+                            # The learner was given this level from the pool meanwhile
+                            continue
+                        surplus = self.add_generated_level(level, partial_levels.get(level.level_num))
+                    if surplus:
+                        self.refill_pool(level.level_num, surplus)
+                    print(f"[INFO] Level {level.level_num} is ready ({len(self.levels)}/{LEVEL_COUNT})")
+                    # Persist every finished level so quitting mid-generation keeps the work
+                    self.save_progress()
+                    wake_main_loop()
+            except Exception as e:
+                # Cancelled calls are expected once generation has been stopped
+                if not self.generation_stopped.is_set():
+                    print(f"[ERROR] Level generation failed: {e}")
+            finally:
+                with self.levels_lock:
+                    # Stop waiting on partial levels generation could not fill
+                    for level in partial_levels.values():
+                        level.pending = 0
+                if self.extraction_stats.as_dict()["responses"]:
+                    print(f"[INFO] Sentence extraction: {self.extraction_stats.summary()}")
+                self.generating_sentences = False
+                wake_main_loop()
+                
+        threading.Thread(target=generate, daemon=True).start()
+        
+    def add_generated_level(self, level, partial=None):
+        """Put a generated level in place, called with levels_lock held
+        
+        Levels are kept in level order. A partial level is filled up from the
+        generated one instead. Returns the sentences not used, for the pool.
+        """
+        if partial is not None:
+            if partial is level:
+                return []  # Streamed into in place
+            needed = max(0, SENTENCES_PER_LEVEL - len(partial.sentences))
+            partial.sentences.extend(level.sentences[:needed])
+            partial.pending = 0
+            return level.sentences[needed:]
+        index = len(self.levels)
+        while index > 0 and self.levels[index - 1].level_num > level.level_num:
+            index -= 1
+        if index < len(self.levels) and index <= self.current_level:
+            # A skipped level the learner has already moved past
+            return level.sentences
+        self.levels.insert(index, level)
+        return []
+        
+    def stop_level_generation(self):
+        """Stop background level generation, dropping calls that have not started yet"""
+        self.generation_stopped.set()
+        executor = self.generation_executor
+        if executor:
+            executor.shutdown(wait=False, cancel_futures=True)
+            
+    def show_generation_progress(self):
+        """Tell the learner which level is still being generated"""
+        ready = len(self.levels)
+        self.status_display.set_status("Generating...")
+        self.feedback_display.set_feedback(
+            f"Preparing level {self.pending_level + 1}... ({ready} of {LEVEL_COUNT} levels ready). "
+            "It will start automatically.", "", True)
+            
+    def wait_for_level(self, level_index):
+        """Wait for a level that is still being generated, falling back to the pool after LEVEL_DEADLINE"""
+        self.pending_level = level_index
+        self.pending_since = time.monotonic()
+        self.schedule_deadline_check(LEVEL_DEADLINE_EVENT)
+        self.show_generation_progress()
+        
+    def schedule_deadline_check(self, event_type):
+        """Wake the main loop with event_type when the learner has waited LEVEL_DEADLINE seconds"""
+        pygame.time.set_timer(event_type, int(LEVEL_DEADLINE * 1000), 1)
+        
+    def deadline_passed(self, since):
+        return since is not None and time.monotonic() - since >= LEVEL_DEADLINE
+        
+    def level_pool_key(self, level_num):
+        """Pool group for a level: sentences fit any level with the same difficulty and phonemes"""
+        config = LEVEL_CONFIGS.get(level_num, DEFAULT_LEVEL_CONFIG)
+        return f"{config['difficulty']}|{config['phonemes']}"
+        
+    def refill_pool(self, level_num, sentences):
+        self.sentence_pool.add(self.level_pool_key(level_num), sentences)
+        
+    def take_from_pool(self, level_num, count, partial=False, used_sentences=(), remember=True):
+        """Take sentences for a level from the pool, skipping any close to one already used
+        
+        With remember False the caller adds them to the history itself once it
+        knows it keeps them.
+        """
+        used = set(used_sentences) | {s["sentence"] for level in list(self.levels) for s in level.sentences}
+        history = self.sentence_index if self.use_dynamic_sentences else None
+        seen = SentenceIndex(NEAR_DUPLICATE_THRESHOLD)
+        
+        def accept(sentence):
+            return (sentence not in used and not (history and history.is_near_duplicate(sentence))
+                    and seen.add_if_new(sentence))
+            
+        sentences = self.sentence_pool.take(self.level_pool_key(level_num), count, accept, partial)
+        if remember:
+            self.remember_sentences(sentences)
+        return sentences
+        
+    def remember_sentences(self, sentences):
+        if self.use_dynamic_sentences:
+            for s in sentences:
+                self.sentence_index.add(s["sentence"])
+        
+    def fill_level_from_pool(self, level_index):
+        """Give the learner a level of stored sentences instead of waiting longer on Bedrock
+        
+        The pool and history files are read and written outside levels_lock, so
+        the generation thread is never held up by the main thread's disk I/O.
+        """
+        with self.levels_lock:
+            level_num = self.levels[-1].level_num + 1 if self.levels else 1
+            if len(self.levels) != level_index or level_num > LEVEL_COUNT:
+                return False
+        sentences = self.take_from_pool(level_num, SENTENCES_PER_LEVEL, remember=False)
+        if not sentences:
+            return False
+        with self.levels_lock:
+            # Generation may have delivered the level while the pool was read
+            delivered = len(self.levels) != level_index
+            if not delivered:
+                self.fallback_levels.add(level_num)
+                self.levels.append(Level(level_num, f"{level_num}", sentences))
+                waker, self.fallback_waker = self.fallback_waker, Future()
+        if delivered:
+            self.refill_pool(level_num, sentences)
+            return len(self.levels) > level_index
+        waker.set_result(None)
+        self.remember_sentences(sentences)
+        print(f"[INFO] Level {level_num} filled from the sentence pool instead of waiting on Bedrock")
+        self.save_progress()
+        return True
+        
+    def top_up_level(self, level):
+        """Fill the rest of a level still streaming in from the pool"""
+        with self.levels_lock:
+            count = level.pending
+        if count <= 0:
+            return
+        sentences = self.take_from_pool(level.level_num, count, partial=True, remember=False)
+        with self.levels_lock:
+            # The stream may have added sentences while the pool was read
+            kept = sentences[:max(0, level.pending)]
+            level.sentences.extend(kept)
+            level.pending -= len(kept)
+        if len(kept) < len(sentences):
+            self.refill_pool(level.level_num, sentences[len(kept):])
+        self.remember_sentences(kept)
+        if kept:
+            print(f"[INFO] Added {len(kept)} sentences from the pool to level {level.level_num}")
             
-            # Create 10 levels with randomized sentences
-            for level_num in range(1, 11):
-                # Generate sentences for this level
-                level_sentences = self.generate_sentences_for_level(level_num)
+    def check_pending_level(self):
+        """Enter the level, or continue with the sentence, the learner is waiting for once it has been generated"""
+        if self.waiting_for_sentence and self.pending_level is None:
+            current = self.levels[self.current_level]
+            if self.deadline_passed(self.waiting_since):
+                self.waiting_since = None
+                self.top_up_level(current)
+            completed, _ = current.get_progress()
+            if not current.pending or len(current.sentences) > completed:
+                self.next_sentence()
                 
-                # Filter out sentences that have been used in previous levels
-                available_sentences = [s for s in level_sentences if s["sentence"] not in used_sentences]
+        if self.pending_level is None:
+            return
+        if self.pending_level >= len(self.levels) and (self.deadline_passed(self.pending_since)
+                                                       or not self.generating_sentences):
+            # Only one try per wait, the pool does not grow while the learner waits
+            self.pending_since = None
+            self.fill_level_from_pool(self.pending_level)
+        if self.pending_level < len(self.levels):
+            level_index = self.pending_level
+            self.pending_level = None
+            self.enter_level(level_index)
+        elif not self.generating_sentences:
+            self.pending_level = None
+            if self.levels:
+                self.feedback_display.set_feedback("Congratulations! You've completed all levels!", "", True)
+            else:
+                self.status_display.set_status("No levels available")
+                self.feedback_display.set_feedback("Could not generate any levels. Please try again later.", "", False)
+        else:
+            self.show_generation_progress()
+        
+    def iter_generated_levels(self, level_nums, used_sentences=None, partial_levels=None):
+        """Generate levels concurrently and yield them in level order
+        
+        Bedrock calls for all levels run in a bounded worker pool, submitted in
+        level order so the next level is always served first. Sentences are
+        deduplicated across levels strictly in level order, so the outcome does
+        not depend on which call happens to finish first. Sentences too similar
+        to any used before, or to another candidate for the same level, are
+        dropped as they arrive. Candidates left over go into the sentence pool.
+        
+        A level the learner was given from the pool while waiting is skipped,
+        and whatever its calls return later goes into the pool instead. A
+        partial level saved before the last quit is streamed into in place
+        when it comes first.
+        """
+        remaining = list(level_nums)
+        # Track all used sentences to avoid repetition across levels
+        used_sentences = set(used_sentences or ())
+        # Cache-only mode replays saved responses, so only compare within this run
+        history = self.sentence_index if self.use_dynamic_sentences else SentenceIndex(NEAR_DUPLICATE_THRESHOLD)
+        level_seen = {level_num: SentenceIndex(NEAR_DUPLICATE_THRESHOLD) for level_num in remaining}
+        candidates = {level_num: [] for level_num in remaining}
+        attempts = {level_num: 0 for level_num in remaining}
+        futures = {}
+        
+        # Daemon workers, so a call still running when the window closes does not keep the process alive
+        executor = DaemonThreadPoolExecutor(GENERATION_MAX_WORKERS, thread_name_prefix="generation")
+        self.generation_executor = executor
+        
+        batch = {"future": None, "levels": []}
+        
+        def submit(level_num):
+            attempts[level_num] += 1
+            futures[level_num] = executor.submit(self.generate_sentences_for_level, level_num)
+            
+        def is_new(level_num, sentence):
+            # Rejects exact and near repeats, remembering new sentences for this level
+            if (sentence in used_sentences or history.is_near_duplicate(sentence)
+                    or not level_seen[level_num].add_if_new(sentence)):
+                with self.rejected_lock:
+                    self.near_duplicates_rejected += 1
+                return False
+            return True
+            
+        def add_candidates(level_num, sentences):
+            for s in sentences:
+                if isinstance(s, dict) and s.get("sentence") and is_new(level_num, s["sentence"]):
+                    candidates[level_num].append(s)
+                    
+        def wait_for(future, level_num):
+            # Wait for a call, giving up early if the learner got the level from the pool
+            while not future.done() and level_num not in self.fallback_levels:
+                wait([future, self.fallback_waker], return_when=FIRST_COMPLETED)
+            return future.done()
+            
+        def refill_when_done(level_num, future):
+            def refill(done):
+                if not done.cancelled() and done.exception() is None:
+                    self.refill_pool(level_num, done.result())
+            future.add_done_callback(refill)
+            
+        def collect(level_num):
+            if level_num in futures:
+                add_candidates(level_num, futures.pop(level_num).result())
+            elif batch["future"] is not None and level_num in batch["levels"]:
+                # Split the batched response across all of its levels
+                results = batch["future"].result()
+                batch["future"] = None
+                for batch_num in batch["levels"]:
+                    if batch_num in self.fallback_levels:
+                        self.refill_pool(batch_num, results.get(batch_num, []))
+                    else:
+                        add_candidates(batch_num, results.get(batch_num, []))
+                # Ask again at once for every level the batch left short, not one at a time
+                for batch_num in batch["levels"]:
+                    if (batch_num in remaining and batch_num not in self.fallback_levels
+                            and batch_num not in futures and attempts[batch_num] <= 3
+                            and len(candidates[batch_num]) < SENTENCES_PER_LEVEL):
+                        submit(batch_num)
+                    
+        first_sentence = Future()
+        
+        def stream_level(level):
+            # Fill the level as sentences arrive, retrying like the non-streamed path
+            try:
+                while attempts[level.level_num] <= 3 and level.pending > 0:
+                    attempts[level.level_num] += 1
+                    try:
+                        for s in self.iter_sentences_for_level(level.level_num):
+                            if not isinstance(s, dict) or not s.get("sentence") or not is_new(level.level_num, s["sentence"]):
+                                continue
+                            with self.levels_lock:
+                                # The main loop may have topped the level up from the pool meanwhile
+                                filled = level.pending <= 0
+                                if not filled:
+                                    if level.level_num not in self.fallback_levels:
+                                        history.add(s["sentence"])
+                                    level.sentences.append(s)
+                                    level.pending -= 1
+                            if filled:
+                                self.refill_pool(level.level_num, [s])
+                                break
+                            if not first_sentence.done():
+                                first_sentence.set_result(None)
+                            wake_main_loop()
+                            if level.pending <= 0:
+                                break
+                    except Exception as e:
+                        print(f"[ERROR] Error streaming sentences: {e}")
+            finally:
+                level.pending = 0
+                if not first_sentence.done():
+                    first_sentence.set_result(None)
+                if level.level_num in self.fallback_levels:
+                    self.refill_pool(level.level_num, level.sentences)
+                wake_main_loop()
+                
+        try:
+            streamed = None
+            if GENERATION_STREAMING and remaining:
+                # Stream the first level so play can start with its first sentence
+                streamed = (partial_levels or {}).get(remaining[0])
+                if streamed is None:
+                    streamed = Level(remaining[0], f"{remaining[0]}", [])
+                    streamed.pending = SENTENCES_PER_LEVEL
+                streamed_before = len(streamed.sentences)
+                futures[streamed.level_num] = executor.submit(stream_level, streamed)
+                remaining.pop(0)
+                
+            # Without streaming, the first level is asked for on its own so play can
+            # start quickly; the others go out together in a single round trip
+            batch_levels = remaining if streamed is not None else remaining[1:]
+            if GENERATION_BATCHED and len(batch_levels) > 1:
+                if streamed is None:
+                    submit(remaining[0])
+                batch["levels"] = list(batch_levels)
+                for level_num in batch["levels"]:
+                    attempts[level_num] += 1
+                batch["future"] = executor.submit(self.generate_sentences_for_levels, batch["levels"])
+            else:
+                for level_num in remaining:
+                    submit(level_num)
+                    
+            if streamed is not None:
+                # Hand the level out as soon as it has a sentence, then wait for it
+                # to fill before deduplicating later levels against it
+                stream_future = futures.pop(streamed.level_num)
+                wait_for(first_sentence, streamed.level_num)
+                if streamed.level_num not in self.fallback_levels:
+                    # first_sentence only resolves empty once the stream has given up
+                    if streamed.sentences:
+                        yield streamed
+                    stream_future.result()
+                    for s in streamed.sentences:
+                        used_sentences.add(s["sentence"])
+                    if len(streamed.sentences) == streamed_before:
+                        # Nothing usable came back, ask for the level the non-streamed way
+                        # with its own retries and the pool behind it
+                        print(f"[ERROR] Streaming level {streamed.level_num} gave no sentences, requesting it again")
+                        attempts[streamed.level_num] = 0
+                        remaining.insert(0, streamed.level_num)
+                        submit(streamed.level_num)
                 
-                # If we don't have enough unique sentences, generate more
-                attempts = 0
-                while len(available_sentences) < 5 and attempts < 3:
-                    more_sentences = self.generate_sentences_for_level(level_num)
-                    for s in more_sentences:
-                        if s["sentence"] not in used_sentences:
-                            available_sentences.append(s)
-                    attempts += 1
+            while remaining:
+                level_num = remaining[0]
+                future = futures.get(level_num)
+                if future is None and level_num in batch["levels"]:
+                    future = batch["future"]
+                if future is not None and not wait_for(future, level_num):
+                    # Given out from the pool, keep what the call returns for next time
+                    if level_num in futures:
+                        refill_when_done(level_num, futures.pop(level_num))
+                    remaining.pop(0)
+                    continue
+                if level_num in self.fallback_levels:
+                    remaining.pop(0)
+                    continue
+                collect(level_num)
+                if level_num in futures:
+                    # The batch came back short and the level was requested again
+                    continue
+                    
+                # Filter out sentences that have been used in previous levels, or are close to them
+                available_sentences = [s for s in candidates[level_num] if s["sentence"] not in used_sentences
+                                       and not history.is_near_duplicate(s["sentence"])]
                 
-                # Select 5 sentences for this level
-                if available_sentences and len(available_sentences) >= 5:
-                    selected = random.sample(available_sentences, 5)
+                if len(available_sentences) >= SENTENCES_PER_LEVEL:
+                    selected = random.sample(available_sentences, SENTENCES_PER_LEVEL)
                     
                     # Add these sentences to the used set
                     for s in selected:
                         used_sentences.add(s["sentence"])
-                        
-                    self.levels.append(Level(level_num, f"{level_num}", selected))
-            
-            # Start with level 1
-            self.current_level = 0
-            
-            # Save the newly generated levels immediately
-            self.save_progress()
-            
-        # Start the game
-        self.game_started = True
-        self.next_sentence()
+                        history.add(s["sentence"])
+                    self.refill_pool(level_num, [s for s in available_sentences if s not in selected])
+                    remaining.pop(0)
+                    yield Level(level_num, f"{level_num}", selected)
+                elif attempts[level_num] <= 3:
+                    # Not enough unique sentences yet, generate more
+                    submit(level_num)
+                else:
+                    remaining.pop(0)
+                    # Make up the shortfall from the pool before giving up on the level
+                    stored = self.take_from_pool(level_num, SENTENCES_PER_LEVEL - len(available_sentences),
+                                                 used_sentences=used_sentences | {s["sentence"] for s in available_sentences})
+                    if stored:
+                        selected = available_sentences + stored
+                        for s in selected:
+                            used_sentences.add(s["sentence"])
+                        for s in available_sentences:
+                            history.add(s["sentence"])
+                        yield Level(level_num, f"{level_num}", selected)
+                    else:
+                        print(f"[ERROR] Not enough unique sentences for level {level_num}, skipping it")
+                    
+                # Retry later levels that already came back short without waiting for their turn
+                if batch["future"] is not None and batch["future"].done():
+                    collect(batch["levels"][0])
+                for later_num in remaining[1:]:
+                    if later_num in futures and futures[later_num].done():
+                        collect(later_num)
+                        if len(candidates[later_num]) < SENTENCES_PER_LEVEL and attempts[later_num] <= 3:
+                            submit(later_num)
+        finally:
+            # Drop queued calls if the consumer stopped early
+            executor.shutdown(wait=False, cancel_futures=True)
+            self.generation_executor = None
     
-    def generate_sentences_for_level(self, level_num):
-        """Generate sentences for a specific level"""
-        # Level-specific configurations
-        level_configs = {
-            1: {"difficulty": "easy", "focus": "basic greetings and introductions", 
-                "length": "5-7 words", "phonemes": "simple consonants and vowels"},
-            2: {"difficulty": "easy", "focus": "daily activities and routines", 
-                "length": "6-8 words", "phonemes": "th, r, l sounds"},
-            3: {"difficulty": "easy", "focus": "shopping and numbers", 
-                "length": "7-9 words", "phonemes": "s, z, sh sounds"},
-            4: {"difficulty": "medium", "focus": "work and education", 
-                "length": "8-10 words", "phonemes": "ch, j, v sounds"},
-            5: {"difficulty": "medium", "focus": "travel and directions", 
-                "length": "9-11 words", "phonemes": "w, y, compound sounds"},
-            6: {"difficulty": "medium", "focus": "food and dining", 
-                "length": "10-12 words", "phonemes": "diphthongs and blends"},
-            7: {"difficulty": "medium", "focus": "health and fitness", 
-                "length": "10-12 words", "phonemes": "consonant clusters"},
-            8: {"difficulty": "hard", "focus": "technology and science", 
-                "length": "11-13 words", "phonemes": "complex consonant clusters"},
-            9: {"difficulty": "hard", "focus": "business and economics", 
-                "length": "12-14 words", "phonemes": "stress patterns and rhythm"},
-            10: {"difficulty": "hard", "focus": "arts, culture and philosophy", 
-                "length": "13-15 words", "phonemes": "advanced pronunciation patterns"}
-        }
-        
-        # Get config for this level or use default
-        config = level_configs.get(level_num, {
-            "difficulty": "medium",
-            "focus": "general topics",
-            "length": "8-12 words",
-            "phonemes": "mixed sounds"
-        })
+    def build_level_prompt(self, level_num):
+        """Build the sentence generation prompt for a specific level"""
+        config = LEVEL_CONFIGS.get(level_num, DEFAULT_LEVEL_CONFIG)
         
         difficulty = config["difficulty"]
         focus = config["focus"]
@@ -506,51 +1178,100 @@ class PronunciationMaster:
         For each sentence, provide a pronunciation tip focusing on 1-2 challenging words or sounds.
         Format your response as a JSON array of objects with 'sentence', 'context', and 'pronunciation_tip' fields.
         """
+        return prompt
         
-        try:
-            print(f"[INFO] Generating sentences for level {level_num} ({difficulty} difficulty)...")
-            response = self.bedrock_client.generate_response(prompt)
-            import re
+    def exclusion_hint(self):
+        """Prompt line steering the model away from openings already overused in the history"""
+        if not self.use_dynamic_sentences:
+            return ""
+        openings = self.sentence_index.exclusion_hint(EXCLUSION_HINT_LIMIT)
+        if not openings:
+            return ""
+        return "Do not start any sentence with these overused openings: " + "; ".join(openings) + ".\n"
         
-            # Extract JSON from response
-            try:
-                # Try direct JSON parsing first
-                sentences = json.loads(response)
+    def iter_sentences_for_level(self, level_num):
+        """Stream sentences for a specific level, yielding each one as soon as it is complete"""
+        print(f"[INFO] Streaming sentences for level {level_num}...")
+        parser = SentenceStreamParser()
+        count = 0
+        for text in self.bedrock_client.stream_response(self.build_level_prompt(level_num),
+                                                       hint=self.exclusion_hint()):
+            for sentence in parser.feed(text):
+                count += 1
+                yield sentence
+        # Only complete streams count, a level that filled up stops reading early
+        self.extraction_stats.record(parser)
+        print(f"[SUCCESS] Streamed {count} sentences for level {level_num}")
+        
+    def generate_sentences_for_level(self, level_num):
+        """Generate sentences for a specific level"""
+        prompt = self.build_level_prompt(level_num)
+        
+        try:
+            print(f"[INFO] Generating sentences for level {level_num}...")
+            response = self.bedrock_client.generate_response(prompt, hint=self.exclusion_hint())
+            sentences = extract_sentences(response, self.extraction_stats)
+            if sentences:
                 print(f"[SUCCESS] Successfully extracted {len(sentences)} sentences")
-                return sentences
-            except json.JSONDecodeError:
-                # If that fails, try to extract JSON with regex
-                json_match = re.search(r'\[.*?\]', response, re.DOTALL)
-                if json_match:
-                    try:
-                        sentences = json.loads(json_match.group(0))
-                        print(f"[SUCCESS] Successfully extracted {len(sentences)} sentences")
-                        return sentences
-                    except json.JSONDecodeError:
-                        print("[ERROR] Failed to parse extracted JSON")
-                        print("[ERROR] Response content: " + response[:100] + "..." if len(response) > 100 else response)
-                        return [{"sentence": "Please try again later.", 
-                                "context": "API error recovery", 
-                                "pronunciation_tip": "Focus on clear pronunciation."}]
-                else:
-                    print("[ERROR] No JSON array found in response")
-                    print("[ERROR] Response content: " + response[:100] + "..." if len(response) > 100 else response)
-                    return [{"sentence": "Please try again later.", 
-                            "context": "API error recovery", 
-                            "pronunciation_tip": "Focus on clear pronunciation."}]
+            else:
+                print("[ERROR] No valid sentences found in response")
+                print("[ERROR] Response content: " + (response[:100] + "..." if len(response) > 100 else response))
+            return sentences
         except Exception as e:
             print(f"[ERROR] Error generating sentences: {e}")
-            return [{"sentence": "Please try again later.", 
-                    "context": "API error recovery", 
-                    "pronunciation_tip": "Focus on clear pronunciation."}]
+            return []
+
+    def generate_sentences_for_levels(self, level_nums):
+        """Generate sentences for several levels with a single Bedrock call
+        
+        Returns a dict mapping each level number to its list of sentences.
+        Levels missing from the response map to an empty list.
+        """
+        level_nums = list(level_nums)
+        level_lines = []
+        for level_num in level_nums:
+            config = LEVEL_CONFIGS.get(level_num, DEFAULT_LEVEL_CONFIG)
+            level_lines.append(
+                f"Level {level_num}: {BATCH_SENTENCES_PER_LEVEL} sentences at {config['difficulty']} level, "
+                f"topics related to {config['focus']}, {config['length']} in length, "
+                f"practicing these phonemes: {config['phonemes']}.")
+        levels_text = "\n        ".join(level_lines)
+        
+        prompt = f"""
+        Generate English sentences for pronunciation practice for each of these levels:
+        {levels_text}
+        Each sentence should be in a different context.
+        Make sure sentences are unique across all levels and not similar to common phrases.
+        For each sentence, provide a pronunciation tip focusing on 1-2 challenging words or sounds.
+        Format your response as a single JSON object whose keys are the level numbers as strings
+        and whose values are JSON arrays of objects with 'sentence', 'context', and 'pronunciation_tip' fields.
+        """
+        
+        results = {level_num: [] for level_num in level_nums}
+        try:
+            print(f"[INFO] Generating sentences for levels {level_nums[0]}-{level_nums[-1]} in one request...")
+            response = self.bedrock_client.generate_response(prompt, max_tokens=BATCH_MAX_TOKENS,
+                                                             hint=self.exclusion_hint())
+            
+            # Keys name the level, possibly as "Level 3" rather than "3"
+            for key, sentence in extract_grouped_sentences(response, self.extraction_stats):
+                digits = "".join(ch for ch in str(key) if ch.isdigit())
+                if digits and int(digits) in results:
+                    results[int(digits)].append(sentence)
+            print(f"[SUCCESS] Batch returned sentences for {sum(1 for v in results.values() if v)} of {len(level_nums)} levels")
+        except Exception as e:
+            print(f"[ERROR] Error generating batched sentences: {e}")
+        return results
 
-    
     def save_progress(self):
         """Save game progress to file"""
         try:
+            # Snapshot the list, background generation may still be appending
+            levels = list(self.levels)
+            
             # Collect all used sentences across levels
             all_sentences = set()
-            for level in self.levels:
+            for level in levels:
                 for sentence_data in level.sentences:
                     all_sentences.add(sentence_data["sentence"])
             
@@ -561,7 +1282,7 @@ class PronunciationMaster:
             }
             
             # Save each level's data
-            for level in self.levels:
+            for level in levels:
                 level_data = {
                     "level_num": level.level_num,
                     "difficulty": level.difficulty,
@@ -573,8 +1294,9 @@ class PronunciationMaster:
                 save_data["levels"].append(level_data)
             
             # Save to file
-            with open("pronunciation_progress.json", "w") as f:
-                json.dump(save_data, f)
+            with self.save_lock:
+                with open("pronunciation_progress.json", "w") as f:
+                    json.dump(save_data, f)
                 
         except Exception as e:
             print(f"Error saving progress: {e}")
@@ -623,7 +1345,8 @@ class PronunciationMaster:
         if completed == total:
             # All sentences completed
             self.feedback_display.set_feedback(f"Level {current.level_num} completed! You can move to the next level.", "", True)
-            self.next_level_button.enabled = True
+            self.next_level_button.set_enabled(True)
+            self.prefetch_audio()
             return True
             
         # Get a sentence that hasn't been completed yet
@@ -635,22 +1358,43 @@ class PronunciationMaster:
             sentence_data = current.get_next_sentence()
             
         if not sentence_data:
+            if current.pending:
+                # The learner is ahead of the sentence stream, continue once more arrive
+                if not self.waiting_for_sentence:
+                    self.waiting_since = time.monotonic()
+                    self.schedule_deadline_check(SENTENCE_DEADLINE_EVENT)
+                self.waiting_for_sentence = True
+                self.status_display.set_status("Generating...")
             return False
             
+        self.waiting_for_sentence = False
         self.current_sentence = sentence_data["sentence"]
         self.current_context = sentence_data.get("context", "")
         self.current_pronunciation_tip = sentence_data.get("pronunciation_tip", "")
         
         # Update display
         self.sentence_display.set_sentence(self.current_sentence, self.current_context)
-        self.feedback_display.text = ""
-        self.feedback_display.correct_pronunciation = ""
-        self.guide.speaking = True
+        self.feedback_display.clear()
+        self.guide.set_speaking(True)
         
         # Play audio automatically
         self.play_audio()
+        self.prefetch_audio()
         return True
         
+    def prefetch_audio(self):
+        """Synthesize the rest of this level and the start of the next one in the background"""
+        if not self.levels or self.current_level >= len(self.levels):
+            return
+        current = self.levels[self.current_level]
+        # The current sentence is loaded by play_audio itself
+        texts = [s["sentence"] for s in current.sentences
+                 if s["sentence"] not in current.completed_sentences and s["sentence"] != self.current_sentence]
+        if self.current_level + 1 < len(self.levels):
+            upcoming = self.levels[self.current_level + 1]
+            texts += [s["sentence"] for s in upcoming.sentences[:PREFETCH_NEXT_LEVEL_SENTENCES]]
+        self.audio_prefetcher.schedule(texts)
+        
     def play_audio(self):
         """Play the current sentence using text-to-speech"""
         if self.playing_audio:
@@ -660,56 +1404,38 @@ class PronunciationMaster:
         self.status_display.set_status("Playing audio...")
         
         def speak_text():
-            temp_file = None
             try:
-                # Generate unique temp filename
-                temp_file = f"temp_audio_{uuid.uuid4().hex}.mp3"
-                
-                # Generate audio
-                tts = gTTS(text=self.current_sentence, lang='en', slow=False)
-                
-                # Save directly to file
-                tts.save(temp_file)
-                
-                try:
-                    # Play the audio
-                    mixer.music.load(temp_file)
-                    mixer.music.play()
-                    
-                    # Wait for audio to finish
-                    while mixer.music.get_busy():
-                        time.sleep(0.1)
-                except Exception as e:
-                    print(f"Error playing audio: {e}")
-                    # Continue without audio playback
-                    time.sleep(2)  # Pause briefly to simulate audio playing
-                    
-                # Start listening after audio finishes
-                if self.auto_mode and not self.auto_listening:
-                    self.start_listening()
-                    
+                # Replays and retries of the same sentence are already decoded in memory
+                sound = self.audio_engine.load(self.current_sentence, TTS_LANG, TTS_SLOW)
             except Exception as e:
                 print(f"Error generating audio: {e}")
-            finally:
-                # Clean up temp file
-                try:
-                    if temp_file and os.path.exists(temp_file):
-                        try:
-                            mixer.music.unload()  # Unload before deleting
-                        except:
-                            pass  # Ignore if mixer is not initialized
-                        os.remove(temp_file)
-                except Exception as e:
-                    print(f"Error cleaning up temp file: {e}")
-                    
-                self.playing_audio = False
-                if self.auto_mode:
-                    self.status_display.set_status("Listening...")
-                else:
-                    self.status_display.set_status("Ready")
+                self.finish_playback(listen=False)
+                return
+                
+            try:
+                if sound is None:
+                    raise RuntimeError("audio mixer is not initialized")
+                # The mixer posts AUDIO_END_EVENT when the clip ends, nothing waits on it here
+                self.audio_engine.play(sound)
+            except Exception as e:
+                print(f"Error playing audio: {e}")
+                # Continue without audio playback, pausing briefly to simulate audio playing
+                pygame.time.set_timer(AUDIO_END_EVENT, 2000, 1)
         
         # Start in a separate thread to avoid freezing the UI
         threading.Thread(target=speak_text).start()
+        
+    def finish_playback(self, listen=True):
+        """Open the microphone once the sentence has been played"""
+        self.playing_audio = False
+        # Start listening after audio finishes
+        if listen and self.auto_mode and not self.auto_listening:
+            self.start_listening()
+        if self.auto_mode:
+            self.status_display.set_status("Listening...")
+        else:
+            self.status_display.set_status("Ready")
+        wake_main_loop()
     
     def start_listening(self):
         """Start listening for speech in a background thread"""
@@ -719,23 +1445,19 @@ class PronunciationMaster:
     
     def listen_for_speech(self):
         """Listen for speech and process it"""
+        sr = timed_import("speech_recognition")
         self.status_display.set_status("Listening...")
         
         try:
-            with sr.Microphone() as source:
-                # Adjust for ambient noise with shorter duration
-                self.recognizer.adjust_for_ambient_noise(source, duration=1)
-                # Set dynamic energy threshold
-                self.recognizer.energy_threshold = 4000
-                self.recognizer.dynamic_energy_threshold = True
-                
-                # Listen with shorter timeout
-                audio = self.recognizer.listen(source, timeout=5, phrase_time_limit=5)
+            # The stream is already open and calibrated, capture starts immediately
+            audio = self.microphone.listen(timeout=LISTEN_TIMEOUT)
                 
             self.status_display.set_status("Processing speech...")
             
-            # Use Google's speech recognition
-            user_said = self.recognizer.recognize_google(audio).lower()
+            # Recognize locally when possible, biased toward the sentence the learner is practicing
+            # Scored as recognized, words the recognizer could not match count against the learner
+            user_said = self.speech_recognizer.recognize(audio, self.current_sentence).lower()
+            shown = display_text(user_said)
             expected = self.current_sentence.lower()
             
             # Compare with current sentence
@@ -765,7 +1487,7 @@ class PronunciationMaster:
                     # Mark sentence as completed
                     current_level.mark_sentence_completed(self.current_sentence)
                     
-                    self.feedback_display.set_feedback(f"Very good! You said: {user_said}", 
+                    self.feedback_display.set_feedback(f"Very good! You said: {shown}", 
                                                     self.current_pronunciation_tip, True)
                     
                     # Save progress after completing a sentence
@@ -778,9 +1500,9 @@ class PronunciationMaster:
                 else:
                     # Don't mark as completed, just give feedback and try again
                     if similarity > 0.5:
-                        feedback = f"Not bad. You said: {user_said}"
+                        feedback = f"Not bad. You said: {shown}"
                     else:
-                        feedback = f"Try again. You said: {user_said}"
+                        feedback = f"Try again. You said: {shown}"
                         
                     self.feedback_display.set_feedback(feedback, self.current_pronunciation_tip, False)
                     
@@ -805,40 +1527,53 @@ class PronunciationMaster:
             self.feedback_display.set_feedback(f"Error: {e}", "", False)
             
         self.auto_listening = False
-        self.guide.speaking = False
+        self.guide.set_speaking(False)
         
         if self.auto_mode and not self.playing_audio:
             self.status_display.set_status("Ready")
     
     def go_to_next_level(self):
         """Advance to the next level"""
+        # Drop the old level's queue, the next level is planned once it is entered
+        self.audio_prefetcher.cancel()
         if self.current_level < len(self.levels) - 1:
-            self.current_level += 1
-            self.next_level_button.enabled = False
-            
-            # Reset any stuck state
-            current = self.levels[self.current_level]
-            if len(current.completed_sentences) == len(current.sentences):
-                # If somehow all sentences are already marked as completed, reset them
-                current.completed_sentences = set()
-                
-            # Get a new sentence from the next level
-            self.next_sentence()
-            
-            # Save progress when advancing levels
-            self.save_progress()
+            self.enter_level(self.current_level + 1)
+        elif self.generating_sentences:
+            # The next level is still being generated, enter it once it is ready
+            self.next_level_button.set_enabled(False)
+            self.wait_for_level(self.current_level + 1)
+        elif self.fill_level_from_pool(self.current_level + 1):
+            # Generation gave up on later levels, continue with stored sentences
+            self.enter_level(self.current_level + 1)
         else:
             self.feedback_display.set_feedback("Congratulations! You've completed all levels!", "", True)
+            
+    def enter_level(self, level_index):
+        """Switch to the given level and start its first sentence"""
+        self.current_level = level_index
+        self.next_level_button.set_enabled(False)
+        
+        # Reset any stuck state
+        current = self.levels[self.current_level]
+        if len(current.completed_sentences) == len(current.sentences):
+            # If somehow all sentences are already marked as completed, reset them
+            current.completed_sentences = set()
+            
+        # Get a new sentence from the next level
+        self.next_sentence()
+        
+        # Save progress when advancing levels
+        self.save_progress()
         
     def toggle_auto_mode(self):
         """Toggle auto mode on/off"""
         self.auto_mode = not self.auto_mode
         if self.auto_mode:
-            self.toggle_button.text = "Pause Auto Mode"
+            self.toggle_button.set_text("Pause Auto Mode")
             if not self.playing_audio and not self.auto_listening:
                 self.play_audio()
         else:
-            self.toggle_button.text = "Resume Auto Mode"
+            self.toggle_button.set_text("Resume Auto Mode")
             self.status_display.set_status("Auto mode paused")
         
     def draw_start_screen(self):
@@ -846,56 +1581,153 @@ class PronunciationMaster:
         self.screen.fill(BLACK)
         
         # Draw title
-        title_font = pygame.font.SysFont('Arial', 48, bold=True)
+        title_font = get_font('Arial', 48, bold=True)
         title_text = "Pronunciation Master"
         title_surface = title_font.render(title_text, True, WHITE)
         title_rect = title_surface.get_rect(center=(WINDOW_WIDTH // 2, 100))
         self.screen.blit(title_surface, title_rect)
         
         # Draw subtitle
-        subtitle_font = pygame.font.SysFont('Arial', 24)
+        subtitle_font = get_font('Arial', 24)
         subtitle_text = "Improve your pronunciation with 10 levels of practice"
         subtitle_surface = subtitle_font.render(subtitle_text, True, LIGHT_BLUE)
         subtitle_rect = subtitle_surface.get_rect(center=(WINDOW_WIDTH // 2, 150))
         self.screen.blit(subtitle_surface, subtitle_rect)
         
         # Set resume button state
-        self.resume_button.enabled = self.has_saved_progress
+        self.resume_button.set_enabled(self.has_saved_progress)
         
         # Draw saved progress info if available
         if self.has_saved_progress and self.levels:
-            info_font = pygame.font.SysFont('Arial', 20)
-            level_info = f"Saved progress: Level {self.current_level + 1} of 10"
+            info_font = get_font('Arial', 20)
+            level_info = f"Saved progress: Level {self.current_level + 1} of {LEVEL_COUNT}"
             info_surface = info_font.render(level_info, True, WHITE)
             info_rect = info_surface.get_rect(center=(WINDOW_WIDTH // 2, 200))
             self.screen.blit(info_surface, info_rect)
-        
-        # Position buttons neatly
-        button_spacing = 80
-        base_y = 280
-
-        self.resume_button.rect.center = (WINDOW_WIDTH // 2, base_y)
-        self.restart_button.rect.center = (WINDOW_WIDTH // 2, base_y + button_spacing)
-        self.toggle_dynamic_button.rect.center = (WINDOW_WIDTH // 2, base_y + button_spacing * 2)
 
         # Draw buttons
-        self.resume_button.draw(self.screen)
-        self.restart_button.draw(self.screen)
-        self.toggle_dynamic_button.draw(self.screen)
+        for button in self.start_widgets:
+            button.dirty = False
+            button.draw(self.screen)
 
+    def draw_game_screen(self):
+        """Draw every element of the in-game screen"""
+        self.screen.fill(BLACK)
+        for widget in self.game_widgets:
+            widget.dirty = False
+            widget.draw(self.screen)
+        self.draw_level_info()
+        
+    def get_level_info(self):
+        """Return the values shown in the level header, or None if there is no level"""
+        if self.levels and self.current_level < len(self.levels):
+            current = self.levels[self.current_level]
+            completed, total = current.get_progress()
+            return (current.level_num, completed, total, int(current.get_completion_percentage()))
+        return None
+        
+    def draw_level_info(self):
+        """Draw the level number and progress header"""
+        self.drawn_level_info = self.get_level_info()
+        if self.drawn_level_info is None:
+            return
+            
+        level_num, completed, total, completion = self.drawn_level_info
+        level_font = get_font(None, 30)
+        
+        # Level info
+        level_text = f"Level {level_num}"
+        level_surface = level_font.render(level_text, True, WHITE)
+        self.screen.blit(level_surface, (50, 20))
+        
+        # Progress
+        progress_text = f"Progress: {completed}/{total} sentences"
+        progress_surface = level_font.render(progress_text, True, WHITE)
+        self.screen.blit(progress_surface, (WINDOW_WIDTH - 250, 20))
+        
+        # Completion percentage
+        completion_text = f"Completion: {completion}% ({completed}/{total})"
+        completion_surface = level_font.render(completion_text, True, 
+                                             GREEN if completion >= 70 else LIGHT_BLUE)
+        self.screen.blit(completion_surface, (WINDOW_WIDTH - 250, 50))
+        
+    def redraw_widgets(self, widgets):
+        """Redraw only the widgets that changed and return the damaged screen areas"""
+        # Read each flag once: background threads mark widgets dirty at any time, and a widget
+        # marked after this snapshot keeps its flag for the next frame instead of losing it
+        dirty = [widget for widget in widgets if widget.dirty]
+        if not dirty:
+            return []
+        for widget in dirty:
+            widget.dirty = False
+        damaged = [widget.bounds for widget in dirty]
+            
+        for area in damaged:
+            self.screen.fill(BLACK, area)
+            
+        # Repaint changed widgets plus anything overlapping a cleared area
+        dirty = set(dirty)
+        for widget in widgets:
+            if widget in dirty or widget.bounds.collidelist(damaged) != -1:
+                widget.draw(self.screen)
+        return damaged
+        
+    def needs_redraw(self):
+        """Check whether the next frame would change anything on screen"""
+        if self.drawn_screen != ("game" if self.game_started else "start"):
+            return True
+        widgets = self.game_widgets if self.game_started else self.start_widgets
+        if any(widget.dirty or widget.animating for widget in widgets):
+            return True
+        return self.game_started and self.get_level_info() != self.drawn_level_info
+        
+    def render(self):
+        """Draw the current screen and return the areas that need to be pushed to the display"""
+        screen_name = "game" if self.game_started else "start"
+        if screen_name != self.drawn_screen:
+            # Switching screens repaints everything
+            self.drawn_screen = screen_name
+            if self.game_started:
+                self.draw_game_screen()
+            else:
+                self.draw_start_screen()
+            return [self.screen.get_rect()]
+            
+        if not self.game_started:
+            return self.redraw_widgets(self.start_widgets)
+            
+        damaged = self.redraw_widgets(self.game_widgets)
+        if self.get_level_info() != self.drawn_level_info:
+            self.screen.fill(BLACK, self.level_info_rect)
+            self.draw_level_info()
+            damaged.append(self.level_info_rect)
+        return damaged
 
-    def run(self):
+    def run(self, startup_report=False):
         running = True
+        first_frame = True
         while running:
+            if self.needs_redraw():
+                events = pygame.event.get()
+            else:
+                # Nothing to draw, sleep until input or a wake-up from a background thread
+                events = [pygame.event.wait(IDLE_WAIT_MS)] + pygame.event.get()
+                
             mouse_pos = pygame.mouse.get_pos()
             mouse_click = False
             
-            for event in pygame.event.get():
+            for event in events:
                 if event.type == pygame.QUIT:
+                    self.stop_level_generation()
+                    self.audio_prefetcher.cancel()
+                    if self._microphone is not None:
+                        self._microphone.stop()
                     # Save progress before quitting
                     if self.game_started:
                         self.save_progress()
                     running = False
+                if event.type == AUDIO_END_EVENT and self.playing_audio:
+                    self.finish_playback()
                 if event.type == pygame.MOUSEBUTTONDOWN:
                     mouse_click = True
             
@@ -912,6 +1744,7 @@ class PronunciationMaster:
                     self.load_progress()
                     self.game_started = True
                     self.next_sentence()
+                    self.resume_level_generation()
                 elif self.restart_button.is_clicked(mouse_pos, mouse_click):
                     # Start new game from level 1 with fresh sentences
                     # Delete any existing progress file to ensure we get new sentences
@@ -924,12 +1757,12 @@ class PronunciationMaster:
                 elif self.toggle_dynamic_button.is_clicked(mouse_pos, mouse_click):
                     # Toggle dynamic sentence generation
                     self.use_dynamic_sentences = not self.use_dynamic_sentences
-                    self.toggle_dynamic_button.text = "Dynamic: " + ("ON" if self.use_dynamic_sentences else "OFF")
-                    # Update the Bedrock client with the new setting
-                    self.bedrock_client.use_dynamic = self.use_dynamic_sentences
-                
-                # Draw start screen
-                self.draw_start_screen()
+                    self.toggle_dynamic_button.set_text("Dynamic: " + ("ON" if self.use_dynamic_sentences else "OFF"))
+                    # Update the Bedrock client with the new setting, if it exists yet. Not under its
+                    # lock, the warm-up thread may hold that while it builds the client
+                    client = self._bedrock_client
+                    if client is not None:
+                        client.use_dynamic = self.use_dynamic_sentences
             else:
                 # Game is running - handle game UI
                 # Update button hover states
@@ -941,45 +1774,28 @@ class PronunciationMaster:
                     self.toggle_auto_mode()
                 if self.next_level_button.is_clicked(mouse_pos, mouse_click):
                     self.go_to_next_level()
-                
-                # Draw everything
-                self.screen.fill(BLACK)
-                self.guide.draw(self.screen)
-                self.sentence_display.draw(self.screen)
-                self.feedback_display.draw(self.screen)
-                self.status_display.draw(self.screen)
-                self.toggle_button.draw(self.screen)
-                self.next_level_button.draw(self.screen)
-                
-                # Draw level info and progress
-                if self.levels and self.current_level < len(self.levels):
-                    current = self.levels[self.current_level]
-                    level_font = pygame.font.Font(None, 30)
-                    
-                    # Level info
-                    level_text = f"Level {current.level_num}"
-                    level_surface = level_font.render(level_text, True, WHITE)
-                    self.screen.blit(level_surface, (50, 20))
                     
-                    # Progress
-                    completed, total = current.get_progress()
-                    progress_text = f"Progress: {completed}/{total} sentences"
-                    progress_surface = level_font.render(progress_text, True, WHITE)
-                    self.screen.blit(progress_surface, (WINDOW_WIDTH - 250, 20))
-                    
-                    # Completion percentage
-                    completion = current.get_completion_percentage()
-                    completion_text = f"Completion: {int(completion)}% ({len(current.completed_sentences)}/{len(current.sentences)})"
-                    completion_surface = level_font.render(completion_text, True, 
-                                                         GREEN if completion >= 70 else LIGHT_BLUE)
-                    self.screen.blit(completion_surface, (WINDOW_WIDTH - 250, 50))
-            
-            pygame.display.flip()
+                # Start a level the learner was waiting on once it is generated
+                self.check_pending_level()
+            
+            # Redraw only what changed and push those areas to the display
+            damaged = self.render()
+            if damaged:
+                pygame.display.update(damaged)
+            if first_frame:
+                first_frame = False
+                startup_profile.mark("first frame")
+                self.start_warm_up(startup_profile.report if startup_report else None)
             self.clock.tick(FPS)
         
         pygame.quit()
         sys.exit()
 
 if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description=WINDOW_TITLE)
+    parser.add_argument("--startup-report", action="store_true",
+                        help="print startup phase and lazy import timings once warm-up finishes")
+    args = parser.parse_args()
     game = PronunciationMaster()
-    game.run()
\ No newline at end of file
+    game.run(startup_report=args.startup_report)
\ No newline at end of file
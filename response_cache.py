@@ -0,0 +1,81 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+
+
+class ResponseCache:
+    """Persistent LRU cache of model responses keyed by model and request body
+
+    Entries expire after ttl seconds and the least recently used entries are
+    evicted once max_entries is exceeded. The cache is stored as a single JSON
+    file that is rewritten atomically after each change.
+    """
+    def __init__(self, path, max_entries=200, ttl=30 * 24 * 3600):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._load()
+
+    @staticmethod
+    def make_key(model_id, request_body):
+        """Content address for a request: hash of the model id and canonical body"""
+        body = json.dumps(request_body, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(f"{model_id}\n{body}".encode("utf-8")).hexdigest()
+
+    def get(self, key):
+        """Return the cached response for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or time.time() - entry["created"] > self.ttl:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry["response"]
+
+    def put(self, key, response):
+        """Store a response and persist the cache"""
+        with self._lock:
+            self._entries[key] = {"created": time.time(), "response": response}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                data = json.load(f)
+            now = time.time()
+            # Entries are stored least recently used first
+            for key, entry in data.get("entries", []):
+                if now - entry["created"] <= self.ttl:
+                    self._entries[key] = entry
+        except Exception as e:
+            print(f"[ERROR] Could not load response cache {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump({"entries": list(self._entries.items())}, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"[ERROR] Could not save response cache {self.path}: {e}")
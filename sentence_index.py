@@ -0,0 +1,185 @@
+import hashlib
+import os
+import random
+import re
+import threading
+from array import array
+from collections import Counter
+
+MERSENNE_PRIME = (1 << 61) - 1
+
+
+def normalize(text):
+    """Lowercase words only, so punctuation and spacing do not hide a duplicate"""
+    return " ".join(re.findall(r"[a-z0-9']+", text.lower()))
+
+
+def opening(text, words=3):
+    """First few words of a sentence, used to spot overused sentence patterns"""
+    return " ".join(normalize(text).split()[:words])
+
+
+def shingles(text):
+    """Hashes of a sentence's word pairs, sorted and without repeats"""
+    words = normalize(text).split()
+    pairs = [" ".join(words[i:i + 2]) for i in range(max(1, len(words) - 1))]
+    return array("Q", sorted({int.from_bytes(hashlib.blake2b(pair.encode("utf-8"), digest_size=8).digest(), "little")
+                              for pair in pairs}))
+
+
+class SentenceIndex:
+    """MinHash LSH index for finding near-duplicate sentences
+
+    Each sentence becomes the set of its word pairs. A MinHash signature of
+    num_hashes values is split into bands of `rows` values and each band is
+    hashed into a bucket, so a lookup only checks the few sentences sharing a
+    bucket instead of the whole history. Candidates are confirmed with the
+    exact Jaccard similarity of their word pairs, and count as near-duplicates
+    at or above threshold: "The store had a sale on seven zesty zucchini"
+    and "The store had a sale on seven sweaters and two shawls" score 0.5.
+
+    With a path, every added sentence is appended to a text file, one per
+    line, and reloaded on start, keeping at most max_entries. Each line also
+    holds the sentence's signature after a tab, so loading a long history
+    does not recompute them. Lines without one, or with one of a different
+    length, are signed again on load.
+    """
+    def __init__(self, threshold=0.35, num_hashes=32, rows=2, path=None, max_entries=20000):
+        self.threshold = threshold
+        self.num_hashes = num_hashes
+        self.rows = rows
+        self.path = path
+        self.max_entries = max_entries
+        # Fixed seed, so bucket keys stay the same between runs
+        rng = random.Random(1)
+        self._permutations = [(rng.randrange(1, MERSENNE_PRIME), rng.randrange(MERSENNE_PRIME))
+                              for _ in range(num_hashes)]
+        self._sentences = []
+        self._shingles = []
+        self._buckets = {}
+        self._openings = Counter()
+        self._lock = threading.Lock()
+        self._load()
+
+    def __len__(self):
+        with self._lock:
+            return len(self._sentences)
+
+    def signature(self, hashes):
+        """MinHash signature of a sentence's shingle hashes"""
+        return [min((a * h + b) % MERSENNE_PRIME for h in hashes) for a, b in self._permutations]
+
+    def similarity(self, first, second):
+        """Exact Jaccard similarity of two sorted shingle arrays"""
+        common = len(set(first).intersection(second))
+        return common / (len(first) + len(second) - common)
+
+    def find(self, text):
+        """Return the most similar indexed sentence at or above the threshold, or None"""
+        hashes = shingles(text)
+        bands = self._bands(self.signature(hashes))
+        with self._lock:
+            best, best_score = None, self.threshold
+            for entry in self._candidates(bands):
+                score = self.similarity(hashes, self._shingles[entry])
+                if score >= best_score:
+                    best, best_score = self._sentences[entry], score
+            return best
+
+    def is_near_duplicate(self, text):
+        return self.find(text) is not None
+
+    def add(self, text):
+        """Index a sentence and append it to the history file"""
+        hashes = shingles(text)
+        signature = self.signature(hashes)
+        bands = self._bands(signature)
+        with self._lock:
+            self._insert(text, hashes, bands)
+            if self.path:
+                try:
+                    with open(self.path, "a", encoding="utf-8") as f:
+                        f.write(self._line(text, signature) + "\n")
+                except OSError as e:
+                    print(f"[ERROR] Could not save sentence history {self.path}: {e}")
+
+    def add_if_new(self, text):
+        """Index a sentence unless it is a near-duplicate, returning whether it was added"""
+        if self.is_near_duplicate(text):
+            return False
+        self.add(text)
+        return True
+
+    def exclusion_hint(self, limit=10):
+        """Most overused sentence openings, to steer the model away from them"""
+        with self._lock:
+            return [text for text, count in self._openings.most_common(limit) if count > 1]
+
+    def _bands(self, signature):
+        """Bucket keys, one per band of the signature"""
+        return [hash((start,) + tuple(signature[start:start + self.rows]))
+                for start in range(0, self.num_hashes - self.rows + 1, self.rows)]
+
+    def _candidates(self, bands):
+        seen = set()
+        for band in bands:
+            entries = self._buckets.get(band, ())
+            # Buckets hold a bare entry number until a second sentence shares them
+            for entry in (entries,) if isinstance(entries, int) else entries:
+                if entry not in seen:
+                    seen.add(entry)
+                    yield entry
+
+    def _insert(self, text, hashes, bands):
+        entry = len(self._sentences)
+        self._sentences.append(text)
+        self._shingles.append(hashes)
+        self._openings[opening(text)] += 1
+        for band in bands:
+            entries = self._buckets.get(band)
+            if entries is None:
+                self._buckets[band] = entry
+            elif isinstance(entries, int):
+                self._buckets[band] = [entries, entry]
+            else:
+                entries.append(entry)
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                lines = [line.strip() for line in f if line.strip()]
+        except OSError as e:
+            print(f"[ERROR] Could not load sentence history {self.path}: {e}")
+            return
+        kept = lines[-self.max_entries:]
+        unsigned = 0
+        for i, line in enumerate(kept):
+            text, _, saved = line.partition("\t")
+            hashes = shingles(text)
+            signature = self._parse_signature(saved)
+            if signature is None:
+                signature = self.signature(hashes)
+                kept[i] = self._line(text, signature)
+                unsigned += 1
+            self._insert(text, hashes, self._bands(signature))
+        if len(lines) > 2 * self.max_entries or unsigned:
+            # Compact the file so it does not grow without bound, and save missing signatures
+            temp_path = f"{self.path}.{os.getpid()}.tmp"
+            try:
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    f.write("\n".join(kept) + "\n")
+                os.replace(temp_path, self.path)
+            except OSError as e:
+                print(f"[ERROR] Could not compact sentence history {self.path}: {e}")
+
+    def _line(self, text, signature):
+        return " ".join(text.split()) + "\t" + " ".join(format(value, "x") for value in signature)
+
+    def _parse_signature(self, saved):
+        try:
+            signature = [int(value, 16) for value in saved.split()]
+        except ValueError:
+            return None
+        return signature if len(signature) == self.num_hashes else None
@@ -0,0 +1,207 @@
+import json
+import threading
+
+MAX_SENTENCE_LENGTH = 300
+
+
+def validate_sentence(obj):
+    """Return a clean copy of a sentence object, or None if it does not fit the schema
+
+    A sentence object needs a 'sentence' string of at least two words.
+    'context' and 'pronunciation_tip' are optional strings, anything else is dropped.
+    """
+    if not isinstance(obj, dict) or not isinstance(obj.get("sentence"), str):
+        return None
+    sentence = " ".join(obj["sentence"].split())
+    if len(sentence.split()) < 2 or len(sentence) > MAX_SENTENCE_LENGTH or not any(ch.isalpha() for ch in sentence):
+        return None
+    context = obj.get("context")
+    tip = obj.get("pronunciation_tip")
+    return {
+        "sentence": sentence,
+        "context": context.strip() if isinstance(context, str) else "",
+        "pronunciation_tip": tip.strip() if isinstance(tip, str) else "",
+    }
+
+
+class SentenceStreamParser:
+    """Incremental parser that pulls sentence objects out of streamed model output
+
+    Text is fed in arbitrary pieces. The parser tracks strings, escapes and
+    bracket depth as it goes, and every innermost JSON object is decoded the
+    moment its closing brace arrives. Valid sentence objects are returned
+    from feed(), so callers can use them before the response ends. Each
+    character is scanned once and only the text of the object being read is
+    retained, so total work is linear in the response length.
+
+    The scan tolerates noisy output: prose and code fences around the JSON
+    are skipped, a string broken by a raw newline is closed at the newline
+    so later objects still parse, and an unfinished object at the end is
+    simply never returned. Counters record what had to be skipped.
+    """
+    def __init__(self):
+        self._text = ""      # Retained text, starting at absolute offset self._offset
+        self._offset = 0
+        self._length = 0
+        self._in_string = False
+        self._escape = False
+        self._string_start = None
+        self._last_string = None
+        self._depth = 0      # Open brackets and braces
+        # One entry per open object: [start offset, contains a nested object, current key]
+        self._open_objects = []
+
+        self.noise = False   # Non-JSON text was skipped
+        self.invalid = 0     # Objects that were not valid JSON or failed validation
+        self.found = 0       # Valid sentence objects returned
+
+    def feed(self, text):
+        """Consume the next piece of text and return the sentence objects it completed"""
+        return [obj for _, obj in self.feed_grouped(text)]
+
+    def feed_grouped(self, text):
+        """Like feed(), but return (key, object) pairs
+
+        The key is the object key the sentence was listed under, such as the
+        level number in a batched response, or None for a top-level array.
+        """
+        completed = []
+        base = self._length
+        self._text += text
+        self._length += len(text)
+
+        for index, ch in enumerate(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._last_string = self._slice(self._string_start + 1, base + index)
+                elif ch == "\n":
+                    # JSON strings cannot hold raw newlines, a quote went missing
+                    self._in_string = False
+                    self._last_string = None
+            elif self._depth == 0:
+                # Outside the JSON value only an opening bracket matters
+                if ch == "{" or ch == "[":
+                    self._open(ch, base + index)
+                elif not ch.isspace():
+                    self.noise = True
+            elif ch == '"':
+                self._in_string = True
+                self._string_start = base + index
+            elif ch == ":":
+                if self._open_objects and self._last_string is not None:
+                    self._open_objects[-1][2] = self._last_string
+            elif ch == "{" or ch == "[":
+                self._open(ch, base + index)
+            elif ch == "]":
+                self._depth -= 1
+            elif ch == "}":
+                self._depth -= 1
+                if self._open_objects:
+                    start, has_child, _ = self._open_objects.pop()
+                    if not has_child:
+                        obj = validate_sentence(self._decode(start, base + index + 1))
+                        if obj is None:
+                            self.invalid += 1
+                        else:
+                            self.found += 1
+                            key = self._open_objects[-1][2] if self._open_objects else None
+                            completed.append((key, obj))
+
+        self._trim()
+        return completed
+
+    @property
+    def truncated(self):
+        """True if the text so far ends inside an unfinished JSON value"""
+        return self._depth > 0
+
+    def _open(self, ch, position):
+        self._depth += 1
+        if ch == "{":
+            if self._open_objects:
+                self._open_objects[-1][1] = True
+            self._open_objects.append([position, False, None])
+
+    def _slice(self, start, end):
+        return self._text[start - self._offset:end - self._offset]
+
+    def _decode(self, start, end):
+        """Decode the text between two absolute offsets, returning None if it is not valid JSON"""
+        try:
+            return json.loads(self._slice(start, end))
+        except ValueError:
+            return None
+
+    def _trim(self):
+        """Drop text that can no longer be part of a decoded object or key"""
+        if self._open_objects and not self._open_objects[-1][1]:
+            keep_from = self._open_objects[-1][0]
+        else:
+            # Only objects without nested objects are decoded, so nothing before here is needed
+            keep_from = self._length
+        if self._in_string:
+            # Keep a string that may turn out to be a key
+            keep_from = min(keep_from, self._string_start)
+        if keep_from > self._offset:
+            self._text = self._text[keep_from - self._offset:]
+            self._offset = keep_from
+
+
+class ExtractionStats:
+    """Running totals of what the extractor recovered from model responses
+
+    A response is 'recovered' when it yielded sentences even though it had
+    prose around the JSON, broken objects or was cut off, so strict JSON
+    parsing would have rejected it and cost another model call.
+    """
+    def __init__(self):
+        self.responses = 0
+        self.clean = 0
+        self.recovered = 0
+        self.recovered_sentences = 0
+        self.empty = 0
+        self.invalid_objects = 0
+        self._lock = threading.Lock()
+
+    def record(self, parser):
+        with self._lock:
+            self.responses += 1
+            self.invalid_objects += parser.invalid
+            if not parser.found:
+                self.empty += 1
+            elif parser.noise or parser.invalid or parser.truncated:
+                self.recovered += 1
+                self.recovered_sentences += parser.found
+            else:
+                self.clean += 1
+
+    def as_dict(self):
+        with self._lock:
+            return {"responses": self.responses, "clean": self.clean, "recovered": self.recovered,
+                    "recovered_sentences": self.recovered_sentences, "empty": self.empty,
+                    "invalid_objects": self.invalid_objects}
+
+    def summary(self):
+        stats = self.as_dict()
+        return (f"{stats['recovered']} of {stats['responses']} responses recovered "
+                f"({stats['recovered_sentences']} sentences), {stats['empty']} unusable, "
+                f"{stats['invalid_objects']} objects dropped")
+
+
+def extract_sentences(text, stats=None):
+    """Return every valid sentence object in a complete model response"""
+    return [obj for _, obj in extract_grouped_sentences(text, stats)]
+
+
+def extract_grouped_sentences(text, stats=None):
+    """Return (key, sentence object) pairs from a complete model response, see feed_grouped()"""
+    parser = SentenceStreamParser()
+    pairs = parser.feed_grouped(text)
+    if stats is not None:
+        stats.record(parser)
+    return pairs
@@ -0,0 +1,84 @@
+import json
+import os
+import threading
+
+
+class SentencePool:
+    """Persistent store of generated sentences for filling levels without waiting on Bedrock
+
+    Sentences are grouped by a key describing the level they were generated
+    for, such as its difficulty and phoneme focus, newest last. Each group
+    keeps at most max_per_key sentences. The pool is stored as one JSON file
+    rewritten atomically after each change.
+    """
+    def __init__(self, path, max_per_key=40):
+        self.path = path
+        self.max_per_key = max_per_key
+        self._groups = {}
+        self._lock = threading.Lock()
+        self._load()
+
+    def count(self, key):
+        with self._lock:
+            return len(self._groups.get(key, []))
+
+    def add(self, key, sentences):
+        """Add sentences to a group, skipping ones it already holds"""
+        with self._lock:
+            group = self._groups.setdefault(key, [])
+            known = {s["sentence"] for s in group}
+            added = False
+            for s in sentences:
+                if isinstance(s, dict) and s.get("sentence") and s["sentence"] not in known:
+                    known.add(s["sentence"])
+                    group.append(s)
+                    added = True
+            if not added:
+                return
+            del group[:-self.max_per_key]
+            self._save()
+
+    def take(self, key, count, accept=None, partial=False):
+        """Remove and return up to count sentences from a group, newest first
+
+        Sentences accept() turns down are dropped from the pool for good.
+        Unless partial is set, nothing is taken when fewer than count are
+        acceptable.
+        """
+        with self._lock:
+            group = self._groups.get(key, [])
+            taken, rejected = [], set()
+            for s in reversed(group):
+                if len(taken) >= count:
+                    break
+                if accept is None or accept(s["sentence"]):
+                    taken.append(s)
+                else:
+                    rejected.add(s["sentence"])
+            if len(taken) < count and not partial:
+                taken = []
+            gone = rejected | {s["sentence"] for s in taken}
+            if gone:
+                self._groups[key] = [s for s in group if s["sentence"] not in gone]
+                self._save()
+            return taken
+
+    def _load(self):
+        if not self.path or not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r") as f:
+                self._groups = json.load(f).get("groups", {})
+        except Exception as e:
+            print(f"[ERROR] Could not load sentence pool {self.path}: {e}")
+
+    def _save(self):
+        if not self.path:
+            return
+        temp_path = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(temp_path, "w") as f:
+                json.dump({"groups": self._groups}, f)
+            os.replace(temp_path, self.path)
+        except Exception as e:
+            print(f"[ERROR] Could not save sentence pool {self.path}: {e}")
@@ -0,0 +1,337 @@
+import argparse
+import json
+import os
+import queue
+import re
+import threading
+import time
+from abc import ABC, abstractmethod
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+
+from call_stats import CallStats
+from startup_profile import timed_import
+
+
+class MicrophoneSession:
+    """Long-lived microphone stream owned by one capture thread
+
+    The stream is opened and calibrated for ambient noise once, when the
+    session starts. listen() hands a request to the capture thread, which
+    is already reading the stream, so an attempt starts capturing at once.
+    Between attempts the thread keeps reading so no stale audio builds up,
+    and every recalibrate_interval seconds it briefly recalibrates, if
+    can_calibrate() allows it. Calibrating while the sentence is played
+    through the speakers would set the threshold from the game's own voice.
+
+    An attempt never waits longer than its timeout plus the phrase limit and
+    a grace period. When the stream fails or the session is stopped, every
+    queued attempt fails at once, and listen() after stop() raises.
+    """
+    def __init__(self, recognizer, calibration_seconds=1.0, recalibration_seconds=0.5,
+                 recalibrate_interval=30.0, phrase_time_limit=5, can_calibrate=None, grace_seconds=5.0):
+        self.recognizer = recognizer
+        self.calibration_seconds = calibration_seconds
+        self.recalibration_seconds = recalibration_seconds
+        self.recalibrate_interval = recalibrate_interval
+        self.phrase_time_limit = phrase_time_limit
+        self.can_calibrate = can_calibrate or (lambda: True)
+        self.grace_seconds = grace_seconds  # Covers a recalibration in progress when an attempt arrives
+        self.calibrations = 0
+        self._requests = queue.Queue()
+        self._started = None  # Resolved once the stream is open and calibrated
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def start(self):
+        """Open the microphone and calibrate in the background, returning a future for when it is ready"""
+        with self._lock:
+            if self._stopped.is_set():
+                raise RuntimeError("Microphone session is stopped")
+            if self._thread is None:
+                self._started = Future()
+                self._thread = threading.Thread(target=self._run, args=(self._started,),
+                                                name="microphone", daemon=True)
+                self._thread.start()
+            return self._started
+
+    def wait_ready(self, timeout=None):
+        """Block until the stream is open and calibrated, raising if opening it failed"""
+        self.start().result(timeout)
+
+    def listen(self, timeout=5):
+        """Return the next utterance, raising WaitTimeoutError if none starts within timeout"""
+        sr = timed_import("speech_recognition")
+        started = self.start()
+        started.result()
+        request = Future()
+        with self._lock:
+            # Checked under the lock the capture thread takes to fail the queue on its way out
+            if self._stopped.is_set():
+                raise RuntimeError("Microphone session is stopped")
+            if self._started is not started or self._thread is None:
+                raise RuntimeError("Microphone stream closed, it is reopened on the next attempt")
+            self._requests.put((request, timeout))
+        wait = None
+        if timeout is not None:
+            wait = timeout + (self.phrase_time_limit or 0) + self.recalibration_seconds + self.grace_seconds
+        try:
+            return request.result(wait)
+        except FutureTimeoutError:
+            request.cancel()
+            raise sr.WaitTimeoutError("Microphone capture did not answer in time")
+
+    def stop(self):
+        with self._lock:
+            self._stopped.set()
+
+    def _run(self, started):
+        sr = timed_import("speech_recognition")
+        try:
+            source = sr.Microphone()
+            source.__enter__()
+            # Leave the threshold where calibration puts it and let it adapt while listening
+            self.recognizer.dynamic_energy_threshold = True
+            self._calibrate(source, self.calibration_seconds)
+        except Exception as e:
+            print(f"[ERROR] Could not open the microphone: {e}")
+            self._reset(e)
+            started.set_exception(e)
+            return
+        started.set_result(None)
+        last_calibration = time.monotonic()
+
+        error = RuntimeError("Microphone session is stopped")
+        try:
+            while not self._stopped.is_set():
+                try:
+                    request, timeout = self._requests.get_nowait()
+                    if not request.set_running_or_notify_cancel():
+                        continue  # The attempt already gave up
+                except queue.Empty:
+                    if (time.monotonic() - last_calibration >= self.recalibrate_interval
+                            and self.can_calibrate()):
+                        self._calibrate(source, self.recalibration_seconds)
+                        last_calibration = time.monotonic()
+                    else:
+                        # Read and drop audio so the next attempt starts with what is said after it
+                        source.stream.read(source.CHUNK)
+                    continue
+                try:
+                    request.set_result(self.recognizer.listen(source, timeout=timeout,
+                                                              phrase_time_limit=self.phrase_time_limit))
+                except Exception as e:
+                    request.set_exception(e)
+        except Exception as e:
+            # The device went away, fail waiting attempts and reopen it on the next one
+            print(f"[ERROR] Microphone stream failed: {e}")
+            error = e
+        finally:
+            try:
+                source.__exit__(None, None, None)
+            except Exception:
+                pass
+            self._reset(error)
+
+    def _reset(self, error):
+        with self._lock:
+            self._thread = None  # The next start() opens the stream again
+            # Nothing serves the queue any more, fail what is in it
+            while True:
+                try:
+                    request, _ = self._requests.get_nowait()
+                except queue.Empty:
+                    break
+                if not request.done():
+                    request.set_exception(error)
+
+    def _calibrate(self, source, seconds):
+        self.recognizer.adjust_for_ambient_noise(source, duration=seconds)
+        self.calibrations += 1
+        print(f"[INFO] Microphone calibrated, energy threshold {self.recognizer.energy_threshold:.0f}")
+
+
+class Recognizer(ABC):
+    """Speech-to-text backend for one utterance
+
+    Subclasses implement _recognize(audio, expected), where audio is a
+    speech_recognition AudioData and expected is the sentence the learner
+    was asked to say, or None. They raise sr.UnknownValueError when nothing
+    intelligible was said and sr.RequestError when the backend itself
+    failed. recognize() wraps it with per-backend CallStats, where nothing
+    intelligible is an answer rather than an error.
+    """
+    name = "recognizer"
+
+    def __init__(self):
+        self.stats = CallStats()
+
+    def available(self):
+        return True
+
+    def recognize(self, audio, expected=None):
+        sr = timed_import("speech_recognition")
+        with self.stats.timed(lambda error: not isinstance(error, sr.UnknownValueError)):
+            return self._recognize(audio, expected)
+
+    @abstractmethod
+    def _recognize(self, audio, expected):
+        """Transcript of audio"""
+
+
+class GoogleRecognizer(Recognizer):
+    """Google's web speech API, one network round trip per utterance"""
+    name = "google"
+
+    def __init__(self, recognizer=None):
+        super().__init__()
+        self.recognizer = recognizer
+
+    def _recognize(self, audio, expected):
+        if self.recognizer is None:
+            self.recognizer = timed_import("speech_recognition").Recognizer()
+        return self.recognizer.recognize_google(audio)
+
+
+UNKNOWN_WORD = "[unk]"
+
+
+class VoskRecognizer(Recognizer):
+    """Offline Kaldi recognizer on the CPU, biased toward the expected sentence
+
+    With an expected sentence, decoding is limited to a grammar of that
+    sentence plus an unknown-word token. Words said right come out as the
+    expected words, and anything else becomes "[unk]". The tokens are kept in
+    the result, so a mumbled word counts against the similarity score
+    instead of being guessed into a random word. display_text() removes them
+    before the transcript is shown to the learner. The model
+    is a directory such as vosk-model-small-en-us-0.15 from
+    https://alphacephei.com/vosk/models, loaded once on first use.
+    """
+    name = "vosk"
+    sample_rate = 16000
+
+    def __init__(self, model_path):
+        super().__init__()
+        self.model_path = model_path
+        self._model = None
+        self._model_lock = threading.Lock()
+
+    def available(self):
+        if not self.model_path or not os.path.isdir(self.model_path):
+            return False
+        try:
+            timed_import("vosk")
+        except ImportError:
+            return False
+        return True
+
+    def _get_model(self):
+        with self._model_lock:
+            if self._model is None:
+                vosk = timed_import("vosk")
+                vosk.SetLogLevel(-1)
+                self._model = vosk.Model(self.model_path)
+            return self._model
+
+    def _recognize(self, audio, expected):
+        sr = timed_import("speech_recognition")
+        vosk = timed_import("vosk")
+        if expected:
+            grammar = [" ".join(re.findall(r"[a-z']+", expected.lower())), UNKNOWN_WORD]
+            recognizer = vosk.KaldiRecognizer(self._get_model(), self.sample_rate, json.dumps(grammar))
+        else:
+            recognizer = vosk.KaldiRecognizer(self._get_model(), self.sample_rate)
+        try:
+            recognizer.AcceptWaveform(audio.get_raw_data(convert_rate=self.sample_rate, convert_width=2))
+            result = json.loads(recognizer.FinalResult())
+        except Exception as e:
+            raise sr.RequestError(f"vosk failed: {e}")
+        text = " ".join(result.get("text", "").split())
+        if not display_text(text):
+            raise sr.UnknownValueError()
+        return text
+
+
+def display_text(text):
+    """Transcript without Vosk's unknown-word tokens, for showing to the learner"""
+    return " ".join(word for word in text.split() if word != UNKNOWN_WORD)
+
+
+RECOGNIZERS = {
+    GoogleRecognizer.name: GoogleRecognizer,
+    VoskRecognizer.name: VoskRecognizer,
+}
+
+
+class RecognizerChain:
+    """Tries recognizers in order, moving on when one fails as a service
+
+    Backends that are not installed are left out. sr.UnknownValueError is
+    an answer, not a failure, so it is raised straight away.
+    """
+    def __init__(self, recognizers):
+        self.recognizers = [r for r in recognizers if r.available()]
+        if not self.recognizers:
+            raise ValueError("No speech recognizer is available")
+
+    @property
+    def names(self):
+        return [r.name for r in self.recognizers]
+
+    def recognize(self, audio, expected=None):
+        sr = timed_import("speech_recognition")
+        error = None
+        for recognizer in self.recognizers:
+            try:
+                return recognizer.recognize(audio, expected)
+            except sr.RequestError as e:
+                print(f"[ERROR] {recognizer.name} recognition failed: {e}")
+                error = e
+        raise error
+
+    def recognizer_stats(self):
+        """Per backend counters, for inspection"""
+        return {r.name: r.stats.as_dict() for r in self.recognizers}
+
+
+def build_recognizers(names, recognizer=None, vosk_model_path=None):
+    """Recognizer backends for the configured names"""
+    backends = []
+    for name in names:
+        if name == VoskRecognizer.name:
+            backends.append(VoskRecognizer(vosk_model_path))
+        elif name == GoogleRecognizer.name:
+            backends.append(GoogleRecognizer(recognizer))
+        else:
+            print(f"[ERROR] Unknown speech recognizer: {name}")
+    return RecognizerChain(backends)
+
+
+def recognize_file(chain, path, expected=None):
+    """Recognize a WAV, AIFF or FLAC recording, for checking a backend without a microphone"""
+    sr = timed_import("speech_recognition")
+    with sr.AudioFile(path) as source:
+        audio = sr.Recognizer().record(source)
+    return chain.recognize(audio, expected)
+
+
+def main():
+    from config import SPEECH_RECOGNIZERS, VOSK_MODEL_PATH
+
+    parser = argparse.ArgumentParser(description="Recognize a recorded utterance with the configured backends")
+    parser.add_argument("path", help="WAV, AIFF or FLAC file")
+    parser.add_argument("--expected", help="sentence the speaker was asked to say")
+    parser.add_argument("--recognizers", default=",".join(SPEECH_RECOGNIZERS), help="comma separated backends")
+    parser.add_argument("--vosk-model", default=VOSK_MODEL_PATH)
+    args = parser.parse_args()
+
+    chain = build_recognizers(args.recognizers.split(","), vosk_model_path=args.vosk_model)
+    start = time.perf_counter()
+    text = recognize_file(chain, args.path, args.expected)
+    print(json.dumps({"text": text, "seconds": round(time.perf_counter() - start, 3),
+                      "recognizers": chain.recognizer_stats()}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
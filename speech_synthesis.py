@@ -0,0 +1,177 @@
+import io
+import shutil
+import subprocess
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from call_stats import CallStats
+from daemon_executor import DaemonThreadPoolExecutor
+from startup_profile import timed_import
+
+
+class Synthesizer(ABC):
+    """Text-to-speech engine returning encoded audio bytes
+
+    Subclasses implement _synthesize(text, lang, slow). synthesize() wraps
+    it with per-engine CallStats, plus the races the engine won.
+    """
+    name = "synthesizer"
+
+    def __init__(self):
+        self.stats = CallStats("wins")
+
+    def available(self):
+        return True
+
+    def synthesize(self, text, lang, slow):
+        with self.stats.timed():
+            return self._synthesize(text, lang, slow)
+
+    @abstractmethod
+    def _synthesize(self, text, lang, slow):
+        """Encoded audio for text"""
+
+
+class GTTSSynthesizer(Synthesizer):
+    """Google Text-to-Speech over the network, MP3 output"""
+    name = "gtts"
+
+    def __init__(self, timeout=10):
+        super().__init__()
+        self.timeout = timeout  # Per HTTP request, gTTS would otherwise wait forever on a stalled connection
+
+    def _synthesize(self, text, lang, slow):
+        buffer = io.BytesIO()
+        timed_import("gtts").gTTS(text=text, lang=lang, slow=slow, timeout=self.timeout).write_to_fp(buffer)
+        return buffer.getvalue()
+
+
+class EspeakSynthesizer(Synthesizer):
+    """Local espeak-ng run as a subprocess, WAV output
+
+    Works offline and answers in well under a second, with a robotic voice.
+    The text goes in on stdin, so it is never parsed as an option.
+    """
+    name = "espeak-ng"
+
+    def __init__(self, executable="espeak-ng", speed=160, slow_speed=120, timeout=10):
+        super().__init__()
+        self.executable = executable
+        self.speed = speed
+        self.slow_speed = slow_speed
+        self.timeout = timeout
+
+    def available(self):
+        return shutil.which(self.executable) is not None
+
+    def _synthesize(self, text, lang, slow):
+        result = subprocess.run(
+            [self.executable, "-v", lang, "-s", str(self.slow_speed if slow else self.speed), "--stdout", "--stdin"],
+            input=text.encode("utf-8"), capture_output=True, timeout=self.timeout, check=True)
+        return result.stdout
+
+
+SYNTHESIZERS = {
+    GTTSSynthesizer.name: GTTSSynthesizer,
+    EspeakSynthesizer.name: EspeakSynthesizer,
+}
+
+
+class SynthesizerRace:
+    """Starts every engine at once and returns the audio worth waiting for
+
+    The first synthesizer is preferred and is used whenever it answers
+    within deadline seconds. Past the deadline, whichever engine finishes
+    first is played instead, so a slow or unreachable network costs at most
+    deadline plus the local engine's time.
+
+    synthesize() returns (data, final). final is False for stand-in audio
+    from a fallback engine. That audio should be played but not cached:
+    when the preferred engine answers late, its audio is kept and returned
+    for the next request for the same text, e.g. a replay.
+
+    Each engine runs on its own threads, so calls stuck on a stalled network
+    never hold up the local engine. No race waits longer than timeout.
+    """
+    def __init__(self, synthesizers, deadline=1.5, max_late=32, timeout=15, workers=4):
+        self.synthesizers = [s for s in synthesizers if s.available()]
+        if not self.synthesizers:
+            raise ValueError("No text-to-speech engine is available")
+        self.deadline = deadline
+        self.max_late = max_late
+        self.timeout = timeout
+        self.stats = {"races": 0, "fallbacks": 0, "late_upgrades": 0}
+        self._late = OrderedDict()  # (text, lang, slow) to audio from the preferred engine after a fallback
+        self._lock = threading.Lock()
+        self._executors = {s.name: DaemonThreadPoolExecutor(workers, thread_name_prefix=f"tts-{s.name}")
+                           for s in self.synthesizers}
+
+    @property
+    def names(self):
+        return [s.name for s in self.synthesizers]
+
+    def synthesize(self, text, lang, slow):
+        key = (text, lang, slow)
+        with self._lock:
+            self.stats["races"] += 1
+            late = self._late.pop(key, None)
+            if late is not None:
+                self.stats["late_upgrades"] += 1
+        if late is not None:
+            return late, True
+
+        give_up = time.monotonic() + self.timeout
+        futures = {self._executors[s.name].submit(s.synthesize, text, lang, slow): s for s in self.synthesizers}
+        preferred = next(iter(futures))
+        wait([preferred], timeout=self.deadline)
+
+        error = None
+        pending = set(futures)
+        while pending:
+            # Past the deadline any finished engine will do, the preferred one first
+            done = [f for f in futures if f in pending and f.done()]
+            if not done:
+                done, _ = wait(pending, timeout=max(0, give_up - time.monotonic()), return_when=FIRST_COMPLETED)
+                if not done:
+                    for future in pending:
+                        future.cancel()  # Still queued behind stalled calls, never start them
+                    raise TimeoutError(f"No text-to-speech engine answered within {self.timeout}s")
+                done = [f for f in futures if f in done]
+            for future in done:
+                pending.discard(future)
+                if future.exception() is not None:
+                    error = future.exception()
+                    continue
+                engine = futures[future]
+                engine.stats.increment("wins")
+                if future is preferred:
+                    return future.result(), True
+                with self._lock:
+                    self.stats["fallbacks"] += 1
+                print(f"[INFO] {futures[preferred].name} missed its {self.deadline}s deadline, "
+                      f"playing {engine.name} audio ({self.summary()})")
+                if not preferred.done():
+                    preferred.add_done_callback(lambda f: self._keep_late(key, f))
+                return future.result(), False
+        raise error
+
+    def summary(self):
+        """One line of per engine counters for the log"""
+        parts = []
+        for s in self.synthesizers:
+            stats = s.stats.as_dict()
+            mean = f"{stats['mean_latency']:.2f}s" if stats["mean_latency"] is not None else "n/a"
+            parts.append(f"{s.name}: {stats['calls']} calls, {stats['errors']} errors, "
+                         f"{stats['wins']} wins, mean {mean}")
+        return "; ".join(parts)
+
+    def _keep_late(self, key, future):
+        if future.cancelled() or future.exception() is not None:
+            return
+        with self._lock:
+            self._late[key] = future.result()
+            while len(self._late) > self.max_late:
+                self._late.popitem(last=False)
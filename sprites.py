@@ -0,0 +1,60 @@
+import os
+import threading
+import pygame
+from config import SCALED_ASSET_CACHE_DIR
+
+_images = {}
+_images_lock = threading.Lock()
+
+
+def to_display_format(surface, alpha=True):
+    """Convert a surface to the display's pixel format so blits need no conversion"""
+    if pygame.display.get_surface() is None:
+        return surface  # No display mode set yet, nothing to convert to
+    return surface.convert_alpha() if alpha else surface.convert()
+
+
+def _scaled_cache_path(path, size):
+    """Return the on-disk cache file for a scaled copy of path"""
+    stat = os.stat(path)
+    name, _ = os.path.splitext(os.path.basename(path))
+    return os.path.join(SCALED_ASSET_CACHE_DIR,
+                        f"{name}_{size[0]}x{size[1]}_{stat.st_mtime_ns}_{stat.st_size}.png")
+
+
+def load_image(path, size=None, alpha=True):
+    """Load an image once, scaled to size and converted to display format
+
+    Scaled copies are kept in SCALED_ASSET_CACHE_DIR so later runs skip the
+    resampling step. Set SCALED_ASSET_CACHE_DIR to None to disable this.
+    """
+    key = (path, size, alpha)
+    with _images_lock:
+        if key in _images:
+            return _images[key]
+
+    image = None
+    cache_path = None
+    if size and SCALED_ASSET_CACHE_DIR:
+        cache_path = _scaled_cache_path(path, size)
+        if os.path.exists(cache_path):
+            try:
+                image = pygame.image.load(cache_path)
+            except pygame.error:
+                image = None
+
+    if image is None:
+        image = pygame.image.load(path)
+        if size:
+            image = pygame.transform.scale(image, size)
+            if cache_path:
+                try:
+                    os.makedirs(SCALED_ASSET_CACHE_DIR, exist_ok=True)
+                    pygame.image.save(image, cache_path)
+                except (OSError, pygame.error) as e:
+                    print(f"Could not cache scaled image {cache_path}: {e}")
+
+    image = to_display_format(image, alpha)
+    with _images_lock:
+        _images[key] = image
+    return image
@@ -0,0 +1,46 @@
+import importlib
+import sys
+import threading
+import time
+
+# Process start is approximated by the first import of this module
+_start = time.perf_counter()
+_phases = []   # (name, seconds since start)
+_imports = []  # (module name, seconds taken, thread name)
+_lock = threading.Lock()
+
+
+def mark(phase):
+    """Record that a startup phase has finished"""
+    with _lock:
+        _phases.append((phase, time.perf_counter() - _start))
+
+
+def timed_import(name):
+    """Import a module on first use, recording how long the import took"""
+    module = sys.modules.get(name)
+    if module is not None:
+        return module
+    started = time.perf_counter()
+    module = importlib.import_module(name)
+    with _lock:
+        _imports.append((name, time.perf_counter() - started, threading.current_thread().name))
+    return module
+
+
+def report():
+    """Print phase timings and lazy import times, slowest import first"""
+    with _lock:
+        phases = list(_phases)
+        imports = sorted(_imports, key=lambda item: item[1], reverse=True)
+
+    print("[INFO] Startup report")
+    print(f"{'phase':<32} {'at ms':>9} {'took ms':>9}")
+    previous = 0
+    for name, at in phases:
+        print(f"{name:<32} {at * 1000:9.1f} {(at - previous) * 1000:9.1f}")
+        previous = at
+    print(f"{'lazy import':<32} {'took ms':>9}  thread")
+    for name, took, thread_name in imports:
+        print(f"{name:<32} {took * 1000:9.1f}  {thread_name}")
+    print("[INFO] Run with python -X importtime for the full import tree")
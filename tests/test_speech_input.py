@@ -0,0 +1,206 @@
+import json
+import os
+import sys
+import threading
+import time
+import types
+
+import pytest
+import speech_recognition as sr
+
+from speech_input import MicrophoneSession, RecognizerChain, VoskRecognizer, display_text, recognize_file
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "short_utterance.wav")
+
+
+class FakeKaldiRecognizer:
+    """Stands in for vosk.KaldiRecognizer, answering with a preset transcript"""
+    instances = []
+    transcript = ""
+
+    def __init__(self, model, sample_rate, grammar=None):
+        self.model = model
+        self.sample_rate = sample_rate
+        self.grammar = json.loads(grammar) if grammar is not None else None
+        self.audio = b""
+        FakeKaldiRecognizer.instances.append(self)
+
+    def AcceptWaveform(self, data):
+        self.audio += data
+        return True
+
+    def FinalResult(self):
+        return json.dumps({"text": FakeKaldiRecognizer.transcript})
+
+
+@pytest.fixture
+def vosk_chain(tmp_path, monkeypatch):
+    """A recognizer chain holding only Vosk, backed by a fake vosk module"""
+    vosk = types.ModuleType("vosk")
+    vosk.SetLogLevel = lambda level: None
+    vosk.Model = lambda path: ("model", path)
+    vosk.KaldiRecognizer = FakeKaldiRecognizer
+    monkeypatch.setitem(sys.modules, "vosk", vosk)
+    FakeKaldiRecognizer.instances = []
+    return RecognizerChain([VoskRecognizer(str(tmp_path))])
+
+
+def test_expected_sentence_becomes_grammar(vosk_chain):
+    FakeKaldiRecognizer.transcript = "the cat's hat please"
+
+    text = recognize_file(vosk_chain, FIXTURE, "The cat's hat, please!")
+
+    assert text == "the cat's hat please"
+    recognizer = FakeKaldiRecognizer.instances[-1]
+    assert recognizer.grammar == ["the cat's hat please", "[unk]"]
+    assert recognizer.sample_rate == 16000
+    # Half a second of 16 kHz, 16-bit mono audio
+    assert len(recognizer.audio) == 16000
+
+
+def test_without_expected_sentence_decodes_freely(vosk_chain):
+    FakeKaldiRecognizer.transcript = "anything at all"
+
+    assert recognize_file(vosk_chain, FIXTURE) == "anything at all"
+    assert FakeKaldiRecognizer.instances[-1].grammar is None
+
+
+def test_unknown_words_are_kept_for_scoring(vosk_chain):
+    FakeKaldiRecognizer.transcript = "[unk] cat's [unk] please"
+
+    text = recognize_file(vosk_chain, FIXTURE, "The cat's hat, please!")
+
+    assert text == "[unk] cat's [unk] please"
+    assert display_text(text) == "cat's please"
+
+
+@pytest.mark.parametrize("transcript", ["", "[unk]", "[unk] [unk]"])
+def test_nothing_recognized_raises_unknown_value(vosk_chain, transcript):
+    FakeKaldiRecognizer.transcript = transcript
+
+    with pytest.raises(sr.UnknownValueError):
+        recognize_file(vosk_chain, FIXTURE, "The cat's hat, please!")
+
+
+class FakeStream:
+    def __init__(self, fail=None, gate=None):
+        self.fail = fail
+        self.gate = gate
+
+    def read(self, size):
+        if self.fail is not None and self.fail.is_set():
+            self.gate.wait()
+            raise OSError("device unplugged")
+        time.sleep(0.01)
+        return b"\0" * size
+
+
+class FakeMicrophone:
+    """Stands in for sr.Microphone without any audio device"""
+    CHUNK = 1024
+    fail = None  # Once set, reads block until gate is set and then fail
+    gate = None
+
+    def __enter__(self):
+        self.stream = FakeStream(FakeMicrophone.fail, FakeMicrophone.gate)
+        return self
+
+    def __exit__(self, *args):
+        pass
+
+
+class FakeRecognizer:
+    """Stands in for sr.Recognizer, listen() blocks until released"""
+    energy_threshold = 300
+    dynamic_energy_threshold = False
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.listening = threading.Event()
+
+    def adjust_for_ambient_noise(self, source, duration):
+        pass
+
+    def listen(self, source, timeout=None, phrase_time_limit=None):
+        self.listening.set()
+        self.release.wait()
+        return "audio"
+
+
+@pytest.fixture
+def microphone(monkeypatch):
+    monkeypatch.setattr(sr, "Microphone", FakeMicrophone)
+    FakeMicrophone.fail = threading.Event()
+    FakeMicrophone.gate = threading.Event()
+    recognizer = FakeRecognizer()
+    session = MicrophoneSession(recognizer, recalibrate_interval=3600, phrase_time_limit=0.1,
+                                recalibration_seconds=0, grace_seconds=0.2)
+    yield session, recognizer
+    recognizer.release.set()
+    FakeMicrophone.gate.set()
+    session.stop()
+
+
+def test_listen_returns_the_captured_utterance(microphone):
+    session, recognizer = microphone
+    recognizer.release.set()
+
+    assert session.listen(timeout=1) == "audio"
+
+
+def test_stalled_capture_times_out(microphone):
+    session, _ = microphone
+
+    start = time.monotonic()
+    with pytest.raises(sr.WaitTimeoutError):
+        session.listen(timeout=0.1)
+    assert time.monotonic() - start < 2
+
+
+def test_stop_fails_queued_attempts_and_later_ones(microphone):
+    session, recognizer = microphone
+    session.wait_ready()
+    first = threading.Thread(target=lambda: session.listen(timeout=None))
+    first.start()
+    recognizer.listening.wait(1)
+    errors = []
+
+    def queued():
+        try:
+            session.listen(timeout=None)
+        except RuntimeError as e:
+            errors.append(e)
+
+    second = threading.Thread(target=queued)
+    second.start()
+    time.sleep(0.05)
+    session.stop()
+    recognizer.release.set()
+    second.join(2)
+
+    assert not second.is_alive() and errors
+    with pytest.raises(RuntimeError):
+        session.listen(timeout=1)
+
+
+def test_stream_failure_fails_queued_attempts(microphone):
+    session, _ = microphone
+    session.wait_ready()
+    # The capture thread is now stuck in a read that is about to fail
+    FakeMicrophone.fail.set()
+    time.sleep(0.05)
+    errors = []
+
+    def queued():
+        try:
+            session.listen(timeout=None)
+        except OSError as e:
+            errors.append(e)
+
+    attempt = threading.Thread(target=queued)
+    attempt.start()
+    time.sleep(0.05)
+    FakeMicrophone.gate.set()
+    attempt.join(2)
+
+    assert not attempt.is_alive() and errors
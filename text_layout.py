@@ -0,0 +1,76 @@
+import threading
+from collections import OrderedDict
+
+# Maximum number of rendered layouts kept around
+LAYOUT_CACHE_SIZE = 128
+
+_layout_cache = OrderedDict()
+_layout_lock = threading.Lock()
+
+
+def _split_long_word(font, word, max_width):
+    """Split a word that is wider than max_width into pieces that fit"""
+    parts = []
+    while word:
+        # Binary search for the longest prefix that still fits
+        low, high = 1, len(word)
+        while low < high:
+            mid = (low + high + 1) // 2
+            if font.size(word[:mid])[0] <= max_width:
+                low = mid
+            else:
+                high = mid - 1
+        parts.append(word[:low])
+        word = word[low:]
+    return parts
+
+
+def wrap_text(font, text, max_width):
+    """Word-wrap text so that every line fits in max_width pixels"""
+    lines = []
+    line = ""
+    for word in text.split(' '):
+        test_line = line + word + " "
+        if font.size(test_line)[0] <= max_width:
+            line = test_line
+            continue
+
+        if line:
+            lines.append(line)
+            line = ""
+
+        if font.size(word)[0] > max_width:
+            # The word does not fit on a line of its own, break it
+            parts = _split_long_word(font, word, max_width)
+            lines.extend(parts[:-1])
+            line = parts[-1] + " "
+        else:
+            line = word + " "
+
+    if line:
+        lines.append(line)
+    return lines
+
+
+def render_text(font, text, max_width, color):
+    """Return the rendered line surfaces for text, cached by (text, font, width, color)"""
+    key = (text, font, max_width, color)
+    with _layout_lock:
+        surfaces = _layout_cache.get(key)
+        if surfaces is not None:
+            _layout_cache.move_to_end(key)
+            return surfaces
+
+    surfaces = [font.render(line, True, color) for line in wrap_text(font, text, max_width)]
+
+    with _layout_lock:
+        _layout_cache[key] = surfaces
+        while len(_layout_cache) > LAYOUT_CACHE_SIZE:
+            _layout_cache.popitem(last=False)
+    return surfaces
+
+
+def clear_layout_cache():
+    """Drop every cached layout"""
+    with _layout_lock:
+        _layout_cache.clear()